@@ -0,0 +1,183 @@
+"""
+Article representation: msgspec structs against the old dict -> JSON -> Pydantic path
+
+Memory: bytes allocated to hold --articles articles, strings included, as
+plain dicts (the old cached form), as Pydantic NewsArticle models (the old
+response form) and as msgspec Article structs.
+
+Throughput, in articles per second over pages of --page-size articles:
+
+- ingest:   NewsAPI JSON bytes to articles
+- cache:    articles to the cached JSON page
+- response: cached JSON page to response bytes; the old path builds the
+            Pydantic response and lets it be validated and serialized the
+            way FastAPI does for a response_model
+
+Usage:
+    python -m benchmarks.article_codec --articles 100000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+import msgspec
+
+from schemas.news import Article, CachedNews, NewsArticle, NewsPayload, NewsResponse
+from services.providers.base import article_id
+from services.providers.newsapi import newsapi_decoder, to_articles
+
+CATEGORY = "technology"
+
+_encoder = msgspec.json.Encoder()
+_cached_decoder = msgspec.json.Decoder(CachedNews)
+
+
+def _newsapi_page(count: int, offset: int = 0) -> bytes:
+    """A NewsAPI top-headlines response body"""
+    now = datetime.now(timezone.utc)
+    articles = [
+        {
+            "source": {"id": None, "name": f"Source {i % 50}"},
+            "author": f"Author {i}",
+            "title": f"Headline number {i} about something that happened today",
+            "description": f"A couple of sentences summarizing story {i}. " * 3,
+            "url": f"https://example.com/news/{i}",
+            "urlToImage": f"https://cdn.example.com/images/{i}.jpg",
+            "publishedAt": (now - timedelta(seconds=i)).isoformat().replace("+00:00", "Z"),
+            "content": f"The first paragraphs of story {i} as NewsAPI truncates them. " * 4,
+        }
+        for i in range(offset, offset + count)
+    ]
+    return json.dumps({"status": "ok", "totalResults": count, "articles": articles}).encode()
+
+
+# ===== Old path =====
+
+def _old_ingest(body: bytes) -> List[Dict]:
+    data = json.loads(body)
+    return [
+        {
+            "id": article_id(item["url"]),
+            "title": item.get("title", "No title"),
+            "description": item.get("description"),
+            "content": item.get("content"),
+            "url": item.get("url"),
+            "image_url": item.get("urlToImage"),
+            "published_at": item.get("publishedAt", datetime.now().isoformat()),
+            "source": item.get("source", {}).get("name", "Unknown"),
+            "author": item.get("author"),
+            "category": CATEGORY,
+        }
+        for item in data.get("articles", [])
+    ]
+
+
+def _old_cache(articles: List[Dict]) -> str:
+    return json.dumps({"articles": articles, "total_results": len(articles)})
+
+
+def _old_response(cached: str) -> bytes:
+    data = json.loads(cached)
+    response = NewsResponse(
+        articles=[NewsArticle(**article) for article in data["articles"]],
+        total_results=data["total_results"],
+        from_cache=True,
+        cache_ttl=100,
+        category=CATEGORY,
+    )
+    # FastAPI re-validates a returned model against response_model, then dumps it
+    validated = NewsResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+# ===== Current path =====
+
+def _new_ingest(body: bytes) -> List[Article]:
+    data = newsapi_decoder.decode(body)
+    return to_articles(data, CATEGORY, len(data.articles))
+
+
+def _new_cache(articles: List[Article]) -> bytes:
+    return _encoder.encode(CachedNews(articles=articles, total_results=len(articles)))
+
+
+def _new_response(cached: bytes) -> bytes:
+    page = _cached_decoder.decode(cached)
+    return _encoder.encode(
+        NewsPayload(
+            articles=page.articles,
+            total_results=page.total_results,
+            from_cache=True,
+            cache_ttl=100,
+            category=CATEGORY,
+        )
+    )
+
+
+def _allocated(build: Callable[[], object]) -> int:
+    """Bytes still allocated once build() has returned (its result is kept alive)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def _rate(function: Callable, inputs: List, articles: int) -> float:
+    """Articles per second processed by function over all inputs"""
+    started = time.perf_counter()
+    for value in inputs:
+        function(value)
+    return articles / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare article representations")
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = args.articles // args.page_size
+    count = pages * args.page_size
+    bodies = [_newsapi_page(args.page_size, page * args.page_size) for page in range(pages)]
+
+    old_articles = [_old_ingest(body) for body in bodies]
+    new_articles = [_new_ingest(body) for body in bodies]
+    old_cached = [_old_cache(page) for page in old_articles]
+    new_cached = [_new_cache(page) for page in new_articles]
+
+    # Built from the raw responses so the memory includes the strings
+    memory = {
+        "dict": _allocated(lambda: [_old_ingest(body) for body in bodies]),
+        "pydantic": _allocated(
+            lambda: [NewsArticle(**article) for body in bodies for article in _old_ingest(body)]
+        ),
+        "msgspec": _allocated(lambda: [_new_ingest(body) for body in bodies]),
+    }
+
+    print(f"memory per {count:,} articles")
+    for name, size in memory.items():
+        print(f"  {name:<10}{size / 2**20:>10.1f} MB")
+
+    print(f"\nthroughput (articles/s, pages of {args.page_size})")
+    print(f"  {'stage':<10}{'old':>12}{'msgspec':>12}{'speedup':>10}")
+    for stage, old, new in (
+        ("ingest", _rate(_old_ingest, bodies, count), _rate(_new_ingest, bodies, count)),
+        ("cache", _rate(_old_cache, old_articles, count), _rate(_new_cache, new_articles, count)),
+        (
+            "response",
+            _rate(_old_response, old_cached, count),
+            _rate(_new_response, new_cached, count),
+        ),
+    ):
+        print(f"  {stage:<10}{old:>12,.0f}{new:>12,.0f}{new / old:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Near-duplicate clustering throughput
+
+Clusters --articles synthetic headlines of 30 words, 1 in 4 being a copy of
+another with one word changed, and reports articles per second for the
+MinHash signatures and for the LSH clustering.
+
+Usage:
+    python -m benchmarks.dedup --articles 1000000
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from services.dedup_service import DedupService
+
+
+def _headlines(count: int) -> List[str]:
+    rng = np.random.default_rng(0)
+    words = np.array([f"w{i}" for i in range(50000)])
+    texts = [" ".join(words[rng.integers(0, len(words), 30)]) for _ in range(count)]
+    for i in rng.integers(0, count, count // 4):
+        tokens = texts[i].split()
+        tokens[rng.integers(0, len(tokens))] = "edited"
+        texts[rng.integers(0, count)] = " ".join(tokens)
+    return texts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=100000)
+    args = parser.parse_args()
+
+    count = args.articles
+    texts = _headlines(count)
+    service = DedupService()
+    started = time.perf_counter()
+    signatures = service.signatures(texts)
+    signed = time.perf_counter()
+    labels = service.cluster(signatures)
+    clustered = time.perf_counter()
+
+    clusters = len(np.unique(labels))
+    print(f"articles:   {count}")
+    print(f"clusters:   {clusters} ({count - clusters} folded)")
+    print(f"minhash:    {signed - started:.2f}s ({count / (signed - started):,.0f} articles/s)")
+    print(f"lsh:        {clustered - signed:.2f}s ({count / (clustered - signed):,.0f} articles/s)")
+
+
+if __name__ == "__main__":
+    main()
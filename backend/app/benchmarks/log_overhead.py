@@ -0,0 +1,119 @@
+"""
+Per-request logging cost on the event loop thread
+
+Simulates the log calls one cached GET /api/news/ makes (router access log,
+cache hit, Redis debug message) under three setups:
+
+- sync:    the original basicConfig handler with eager f-strings
+- queue:   core.logger (QueueHandler + listener thread) with lazy %-args
+- sampled: the same, keeping 10% of access log records
+
+Output goes to a temporary file. Each flush can be slowed down with
+--write-latency-us to model stdout piped to a busy log collector, which is
+where a synchronous handler stalls the event loop.
+
+Usage:
+    python -m benchmarks.log_overhead --requests 100000 --write-latency-us 50
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+
+from core import logger as log_module
+
+CATEGORY = "technology"
+PAGE = 1
+
+
+class SlowStream:
+    """File stream whose flush blocks for a fixed time, like a full pipe"""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.stream.flush()
+
+
+def _request_sync(logger: logging.Logger) -> None:
+    logger.info(f"GET /api/news/ - category={CATEGORY}, page={PAGE}, force_refresh=False")
+    logger.debug(f"✅ Cache HIT: news:{{{CATEGORY}}}:page:{PAGE}")
+    logger.info(f"Cache HIT: news:{{{CATEGORY}}}:page:{PAGE}")
+
+
+def _request_lazy(logger: logging.Logger, access: logging.Logger) -> None:
+    access.info("GET /api/news/ - category=%s, page=%s, force_refresh=%s", CATEGORY, PAGE, False)
+    logger.debug("✅ Cache HIT: news:{%s}:page:%s", CATEGORY, PAGE)
+    access.info("Cache HIT: news:{%s}:page:%s", CATEGORY, PAGE)
+
+
+def _reset_root() -> None:
+    log_module.shutdown_logging()
+    root = logging.getLogger()
+    for handler in root.handlers:
+        handler.close()
+    root.handlers = []
+
+
+def bench_sync(requests: int, stream) -> float:
+    _reset_root()
+    logging.basicConfig(
+        level=logging.INFO, format=log_module.TEXT_FORMAT, stream=stream, force=True
+    )
+    logger = logging.getLogger(log_module.LOGGER_NAME)
+    started = time.perf_counter()
+    for _ in range(requests):
+        _request_sync(logger)
+    return time.perf_counter() - started
+
+
+def bench_queue(requests: int, stream, sample_rate: float) -> tuple:
+    _reset_root()
+    stdout, sys.stdout = sys.stdout, stream
+    try:
+        log_module.setup_logging(level="INFO", fmt="text", access_sample_rate=sample_rate)
+    finally:
+        sys.stdout = stdout
+    started = time.perf_counter()
+    for _ in range(requests):
+        _request_lazy(log_module.logger, log_module.access_logger)
+    caller = time.perf_counter() - started
+    # Stopping the listener drains the queue: the total includes the writes
+    log_module.shutdown_logging()
+    return caller, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--write-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryFile("w") as file:
+        stream = SlowStream(file, args.write_latency_us / 1e6)
+        sync = bench_sync(args.requests, stream)
+        queue_caller, queue_total = bench_queue(args.requests, stream, 1.0)
+        sampled_caller, sampled_total = bench_queue(args.requests, stream, 0.1)
+    _reset_root()
+
+    per_request = 1e6 / args.requests
+    print(f"requests: {args.requests}, write latency: {args.write_latency_us}µs")
+    print(f"{'setup':<10}{'event loop µs/req':>20}{'incl. writes µs/req':>22}")
+    print(f"{'sync':<10}{sync * per_request:>20.2f}{sync * per_request:>22.2f}")
+    for name, caller, total in (
+        ("queue", queue_caller, queue_total),
+        ("sampled", sampled_caller, sampled_total),
+    ):
+        print(f"{name:<10}{caller * per_request:>20.2f}{total * per_request:>22.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Redis connection pool contention
+
+Runs --concurrency tasks issuing GETs back to back through the client
+RedisManager builds (BlockingConnectionPool), once per pool size, and
+reports how long commands waited for a free connection next to their total
+latency. A pool smaller than the number of concurrent callers shows up as
+queueing time rather than "Too many connections" errors; callers only fail
+once they have waited REDIS_POOL_TIMEOUT.
+
+Needs a Redis server at REDIS_URL (or --url).
+
+Usage:
+    python -m benchmarks.redis_pool --pool-sizes 5,20,50 --concurrency 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from redis.exceptions import ConnectionError
+
+from core.config import settings
+from core.redis import RedisManager
+
+KEY = "benchmark:redis_pool"
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100)[int(pct) - 1]
+
+
+async def run(url: str, pool_size: int, concurrency: int, duration: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (ms) for one pool size"""
+    manager = RedisManager()
+    manager._url = url
+    client = manager._create_client(
+        settings.model_copy(update={"REDIS_MAX_CONNECTIONS": pool_size})
+    )
+    pool = client.connection_pool
+
+    waits: List[float] = []
+    latencies: List[float] = []
+    timeouts = 0
+    get_connection = pool.get_connection
+
+    async def timed_get_connection(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await get_connection(*args, **kwargs)
+        finally:
+            waits.append(time.perf_counter() - started)
+
+    pool.get_connection = timed_get_connection
+    await client.set(KEY, "x" * 256)
+
+    stop_at = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal timeouts
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            try:
+                await client.get(KEY)
+            except ConnectionError:
+                # No connection freed up within REDIS_POOL_TIMEOUT
+                timeouts += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await client.delete(KEY)
+        await client.aclose(close_connection_pool=True)
+
+    waits_ms = [wait * 1000 for wait in waits]
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "ops": len(latencies) / duration,
+        "wait_p50": _percentile(waits_ms, 50),
+        "wait_p99": _percentile(waits_ms, 99),
+        "wait_max": max(waits_ms, default=0.0),
+        "latency_p50": _percentile(latencies_ms, 50),
+        "latency_p99": _percentile(latencies_ms, 99),
+        "timeouts": timeouts,
+    }
+
+
+def _parse_sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size.strip()]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure Redis pool contention latency")
+    parser.add_argument("--url", default=settings.REDIS_URL)
+    parser.add_argument("--pool-sizes", type=_parse_sizes, default=[5, 20, 50])
+    parser.add_argument("--concurrency", type=int, default=200, help="Concurrent callers")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per pool size")
+    args = parser.parse_args()
+
+    print(f"concurrency: {args.concurrency}, {args.duration}s per pool size")
+    print(
+        f"{'pool':<6}{'ops/s':>10}{'wait p50':>11}{'wait p99':>11}{'wait max':>11}"
+        f"{'total p50':>11}{'total p99':>11}{'timeouts':>10}   (ms)"
+    )
+    for size in args.pool_sizes:
+        result = await run(args.url, size, args.concurrency, args.duration)
+        print(
+            f"{size:<6}{result['ops']:>10.0f}{result['wait_p50']:>11.2f}"
+            f"{result['wait_p99']:>11.2f}{result['wait_max']:>11.2f}"
+            f"{result['latency_p50']:>11.2f}"
+            f"{result['latency_p99']:>11.2f}{result['timeouts']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
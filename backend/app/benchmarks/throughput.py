@@ -0,0 +1,171 @@
+"""
+GET /api/news/ throughput from 1 to N gunicorn workers
+
+Starts the production server (gunicorn_conf.py) once per worker count,
+serving a generated fixture feed so no external API is involved, and drives
+it for a fixed time from several load generator processes, each keeping
+--concurrency requests in flight. Redis settings are taken from the
+environment as usual; without a reachable Redis every request rebuilds the
+page from the fixture, which is the CPU-bound case worth scaling.
+
+Usage:
+    python -m benchmarks.throughput --workers 1,2,4 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import httpx
+
+from gunicorn_conf import available_cpus
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATEGORY = "technology"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _write_fixture(directory: str, count: int) -> None:
+    """NewsAPI-format response with `count` articles for CATEGORY"""
+    now = datetime.now(timezone.utc)
+    articles = [
+        {
+            "source": {"id": None, "name": f"Source {i % 20}"},
+            "author": f"Author {i}",
+            "title": f"Benchmark headline number {i}",
+            "description": f"Description of benchmark story {i} " * 5,
+            "url": f"https://example.com/story/{i}",
+            "urlToImage": f"https://example.com/story/{i}.jpg",
+            "publishedAt": (now - timedelta(minutes=i)).isoformat().replace("+00:00", "Z"),
+            "content": "Lorem ipsum " * 50,
+        }
+        for i in range(count)
+    ]
+    payload = {"status": "ok", "totalResults": count, "articles": articles}
+    with open(os.path.join(directory, f"{CATEGORY}.json"), "w") as f:
+        json.dump(payload, f)
+
+
+def _start_server(workers: int, port: int, fixtures: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        NEWS_PROVIDERS='["fixtures"]',
+        NEWS_FIXTURES_DIR=fixtures,
+        RATE_LIMIT_ENABLED="false",
+        LOG_LEVEL="WARNING",
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "-c", "gunicorn_conf.py",
+            "-w", str(workers), "-b", f"127.0.0.1:{port}", "main:app",
+        ],
+        cwd=APP_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    while time.perf_counter() - started < 30:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {server.returncode}")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError("gunicorn did not answer /health within 30s")
+
+
+async def _load(url: str, concurrency: int, duration: float) -> Tuple[int, int]:
+    """Keep `concurrency` requests in flight; returns (succeeded, failed)"""
+    succeeded = failed = 0
+    stop_at = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10.0) as client:
+        async def loop() -> None:
+            nonlocal succeeded, failed
+            while time.perf_counter() < stop_at:
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                except httpx.HTTPError:
+                    failed += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return succeeded, failed
+
+
+def _load_process(args: Tuple[str, int, float]) -> Tuple[int, int]:
+    return asyncio.run(_load(*args))
+
+
+def run(workers: int, args: argparse.Namespace, fixtures: str) -> Tuple[float, int]:
+    """Requests per second served by `workers` workers, and failed requests"""
+    port = _free_port()
+    server = _start_server(workers, port, fixtures)
+    url = f"http://127.0.0.1:{port}/api/news/?category={CATEGORY}&page_size={args.page_size}"
+    try:
+        # Warm up every worker's caches and connections before measuring
+        asyncio.run(_load(url, args.concurrency, 1.0))
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.map(
+                _load_process, [(url, args.concurrency, args.duration)] * args.clients
+            )
+    finally:
+        server.terminate()
+        server.wait()
+    succeeded = sum(ok for ok, _ in results)
+    failed = sum(ko for _, ko in results)
+    return succeeded / args.duration, failed
+
+
+def _parse_workers(value: str) -> List[int]:
+    return sorted({int(count) for count in value.split(",") if count.strip()})
+
+
+def main() -> None:
+    cpus = available_cpus()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--workers", type=_parse_workers, default=sorted({1, cpus}),
+        help="Comma-separated worker counts (default: 1 and the available CPUs)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight per client")
+    parser.add_argument("--articles", type=int, default=500, help="Articles in the fixture")
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"available CPUs: {cpus}, clients: {args.clients} x {args.concurrency} in flight")
+    print(f"{'workers':<10}{'req/s':>12}{'speedup':>10}{'failed':>10}")
+    with tempfile.TemporaryDirectory() as fixtures:
+        _write_fixture(fixtures, args.articles)
+        baseline = None
+        for workers in args.workers:
+            rate, failed = run(workers, args, fixtures)
+            if baseline is None:
+                baseline = rate or 1.0
+            print(f"{workers:<10}{rate:>12.1f}{rate / baseline:>9.2f}x{failed:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import json
 
 
@@ -12,10 +12,38 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     SECRET_KEY: str = "your-secret-key-change-in-production"
     
+    # ===== Logging =====
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json"
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0  # Fraction of per-request logs kept
+    
+    # ===== Server (gunicorn_conf.py) =====
+    SERVER_PORT: int = 9000
+    SERVER_KEEPALIVE: int = 5
+    WEB_CONCURRENCY: int = 0  # 0 = one worker per available CPU
+    WORKER_MAX_REQUESTS: int = 10000  # Recycle workers to cap memory growth
+    WORKER_MAX_REQUESTS_JITTER: int = 1000
+    WORKER_TIMEOUT: int = 60
+    WORKER_GRACEFUL_TIMEOUT: int = 30
+    
     # ===== News API =====
     NEWS_API_KEY: str = ""
     NEWS_API_BASE_URL: str = "https://newsapi.org/v2"
     
+    # ===== News providers =====
+    # Queried concurrently; each one skips itself when not configured
+    NEWS_PROVIDERS: List[str] = ["newsapi", "rss", "fixtures"]
+    NEWS_PROVIDER_TIMEOUT: float = 5.0
+    NEWS_PROVIDER_TIMEOUTS: Dict[str, float] = {}  # Per-provider overrides
+    NEWS_RSS_FEEDS: Dict[str, List[str]] = {}  # {"technology": ["https://.../feed"]}
+    NEWS_FIXTURES_DIR: str = ""  # <dir>/<category>.json in NewsAPI format
+    
+    # ===== Near-duplicate clustering =====
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.5  # Estimated Jaccard similarity of title + description bigrams
+    DEDUP_NUM_PERM: int = 64  # MinHash permutations
+    DEDUP_BANDS: int = 16  # LSH bands; DEDUP_NUM_PERM must be a multiple
+    
     # ===== Database =====
     POSTGRES_USER: str = "news_user"
     POSTGRES_PASSWORD: str = "news_password"
@@ -37,6 +65,17 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     REDIS_DECODE_RESPONSES: bool = True
+    REDIS_MODE: str = "standalone"  # "standalone", "cluster" or "sentinel"
+    REDIS_CLUSTER_NODES: str = ""  # "host1:6379,host2:6379"
+    REDIS_SENTINEL_NODES: str = ""  # "host1:26379,host2:26379"
+    REDIS_SENTINEL_MASTER: str = "mymaster"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 2.0  # Max wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_RETRY_ATTEMPTS: int = 2
+    REDIS_RECONNECT_INTERVAL: float = 5.0
+    REDIS_RECONNECT_MAX_INTERVAL: float = 60.0
     
     @property
     def REDIS_URL(self) -> str:
@@ -53,6 +92,48 @@ class Settings(BaseSettings):
     CACHE_TTL_NEWS: int = 180
     CACHE_TTL_USER: int = 600
     
+    # Adaptive news TTL: refresh once ~CHANGE_TARGET of a category's articles
+    # are expected to have changed, based on an EWMA of the observed change rate
+    CACHE_TTL_ADAPTIVE: bool = True
+    CACHE_TTL_NEWS_MIN: int = 60
+    CACHE_TTL_NEWS_MAX: int = 1800
+    CACHE_TTL_EWMA_ALPHA: float = 0.3
+    CACHE_TTL_CHANGE_TARGET: float = 0.2
+    NEWS_CHANGES_MAXLEN: int = 1000  # Entries kept in each category change log
+    
+    # ===== Request deadlines =====
+    REQUEST_TIMEOUT_HEADER: str = "X-Request-Timeout"  # Seconds the client is willing to wait
+    REQUEST_TIMEOUT_DEFAULT: float = 8.0
+    REQUEST_TIMEOUT_MAX: float = 30.0
+    DEADLINE_REDIS_SHARE: float = 0.25  # Fraction of the remaining time one Redis call may use
+    DEADLINE_FETCH_SHARE: float = 0.8  # Fraction left for the upstream fan-out
+    DEADLINE_MIN_BUDGET: float = 0.05  # Floor so a late cache write still gets a chance
+    DEADLINE_GRACE: float = 1.0  # Past the deadline, the request is cancelled with 504
+    
+    # ===== Rate limiting (per client, shared across workers via Redis) =====
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "300/minute"  # Any /api route
+    # Stricter limits: "METHOD /path", optionally with query params that must match
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /api/news/refresh": "5/minute",
+        "GET /api/news/?force_refresh=true": "10/minute",
+    }
+    RATE_LIMIT_CLIENTS: Dict[str, str] = {}  # Client IP -> default limit override
+    RATE_LIMIT_TRUST_PROXY: bool = False  # Identify clients by X-Forwarded-For
+    RATE_LIMIT_TRUSTED_HOPS: int = 1  # Proxies in front of the app appending to X-Forwarded-For
+    
+    # ===== Image proxy =====
+    IMAGE_PROXY_ENABLED: bool = True
+    PUBLIC_BASE_URL: str = "http://localhost:9000"  # Used to build proxied image URLs
+    IMAGE_CACHE_DIR: str = "/tmp/news-images"
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Shared by all workers
+    IMAGE_CACHE_SCAN_INTERVAL: float = 30.0  # Seconds between rescans of the shared directory
+    IMAGE_THUMBNAIL_WIDTHS: List[int] = [320, 640, 1280]
+    IMAGE_FETCH_CONCURRENCY: int = 8
+    IMAGE_FETCH_TIMEOUT: float = 10.0
+    IMAGE_MAX_SOURCE_BYTES: int = 10 * 1024 * 1024
+    IMAGE_URL_TTL: int = 86400  # How long an article ID resolves to its image
+    
     # ===== CORS =====
     CORS_ORIGINS: str = '["http://localhost:4200", "http://localhost:4300"]'
     
@@ -76,16 +157,3 @@ class Settings(BaseSettings):
 # Create settings instance
 settings = Settings()
 
-
-# Debug: Print loaded settings (optional, remove in production)
-if settings.DEBUG:
-    import sys
-    if "pytest" not in sys.modules:  # Don't print during tests
-        print(f"📋 Loaded settings:")
-        print(f"   APP_NAME: {settings.APP_NAME}")
-        print(f"   APP_VERSION: {settings.APP_VERSION}")
-        print(f"   DEBUG: {settings.DEBUG}")
-        print(f"   POSTGRES_HOST: {settings.POSTGRES_HOST}")
-        print(f"   REDIS_HOST: {settings.REDIS_HOST}")
-        print(f"   CACHE_TTL_NEWS: {settings.CACHE_TTL_NEWS}s")
-        print(f"   CORS_ORIGINS: {settings.get_cors_origins}")
@@ -1,38 +1,51 @@
-import os
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, Optional
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from core.config import settings
 
-# Load environment variables from the .env file (useful for local development)
-load_dotenv()
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session, sessionmaker
 
-# PostgreSQL database configuration
-DB_USER = os.getenv("POSTGRES_USER", "postgres")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
-DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
-DB_PORT = os.getenv("POSTGRES_PORT", "5432")
-DB_NAME = os.getenv("POSTGRES_DB", "mydatabase")
+# SQLAlchemy is imported on first use: mounting the item routes must not
+# load it on the cold start path, and importing models opens no pool
+_engine: Optional["Engine"] = None
+_session_factory: Optional["sessionmaker"] = None
 
-# SQLAlchemy connection URL for PostgreSQL
-SQLALCHEMY_DATABASE_URL = (
-    f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
 
-# Create the SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+def __getattr__(name):
+    # Base class for ORM models, created when the models are first imported
+    if name == "Base":
+        from sqlalchemy.orm import declarative_base
 
-# Configure the session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        global Base
+        Base = declarative_base()
+        return Base
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Base class for ORM models
-Base = declarative_base()
 
+def get_engine() -> "Engine":
+    """Return the SQLAlchemy engine, creating it on first call."""
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine
 
-def get_db() -> Generator[Session, None, None]:
+        _engine = create_engine(settings.DATABASE_URL)
+    return _engine
+
+
+def get_session_factory() -> "sessionmaker":
+    """Return the session factory bound to the engine, creating it on first call."""
+    global _session_factory
+    if _session_factory is None:
+        from sqlalchemy.orm import sessionmaker
+
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_factory
+
+
+def get_db() -> Generator["Session", None, None]:
     """Dependency that provides a database session and ensures proper cleanup."""
-    db: Session = SessionLocal()
+    db: "Session" = get_session_factory()()
     try:
         yield db
     finally:
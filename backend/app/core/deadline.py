@@ -0,0 +1,148 @@
+import asyncio
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.logger import logger
+
+# Absolute time.monotonic() by which the current request must be answered.
+# Context variables are copied into tasks, so gathered fetches inherit it.
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the request deadline passes before any useful result exists"""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Run the enclosed code under a deadline `seconds` from now (None: no deadline)"""
+    token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (never negative), or None without one"""
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return max(expires - time.monotonic(), 0.0)
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed"""
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def budget(share: float = 1.0, cap: Optional[float] = None) -> Optional[float]:
+    """
+    Time a stage may spend: `share` of what is left, at least
+    DEADLINE_MIN_BUDGET and at most `cap`
+
+    Returns None (no limit) when there is neither a deadline nor a cap.
+    """
+    left = remaining()
+    if left is None:
+        return cap
+    seconds = max(left * share, settings.DEADLINE_MIN_BUDGET)
+    return seconds if cap is None else min(seconds, cap)
+
+
+class DeadlineMiddleware:
+    """
+    Give each /api request a deadline and stop its work when it is moot
+
+    The deadline comes from the REQUEST_TIMEOUT_HEADER header (seconds) or
+    REQUEST_TIMEOUT_DEFAULT, capped at REQUEST_TIMEOUT_MAX. The request is
+    cancelled if the client disconnects, and answered with 504 if it is still
+    running DEADLINE_GRACE seconds past its deadline.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    def _get_timeout(self, scope: Scope) -> float:
+        value = Headers(scope=scope).get(settings.REQUEST_TIMEOUT_HEADER)
+        try:
+            timeout = float(value) if value else settings.REQUEST_TIMEOUT_DEFAULT
+        except ValueError:
+            timeout = settings.REQUEST_TIMEOUT_DEFAULT
+        if not math.isfinite(timeout):
+            # "nan" and "inf" parse, but would disable the deadline
+            timeout = settings.REQUEST_TIMEOUT_DEFAULT
+        return min(max(timeout, 0.0), settings.REQUEST_TIMEOUT_MAX)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        timeout = self._get_timeout(scope)
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = False
+        response_started = False
+        response_complete = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started, response_complete
+            response_started = True
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                response_complete = True
+            await send(message)
+
+        with deadline(timeout):
+            # The task copies the current context, deadline included
+            task = asyncio.create_task(self.app(scope, messages.get, send_wrapper))
+
+        async def watch_disconnect() -> None:
+            # Owns the real receive channel and relays it to the app
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    # Servers also report a disconnect once the response is sent
+                    if not response_complete:
+                        disconnected = True
+                        task.cancel()
+                    return
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout + settings.DEADLINE_GRACE)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            watcher.cancel()
+
+        if not done:
+            task.cancel()
+            await asyncio.wait({task})
+            logger.warning(
+                "⏰ %s %s overran its %.2fs deadline", scope["method"], scope["path"], timeout
+            )
+            if not response_started:
+                await JSONResponse({"detail": "Deadline exceeded"}, status_code=504)(
+                    scope, receive, send
+                )
+            return
+
+        if task.cancelled():
+            if disconnected:
+                logger.info(
+                    "🔌 Client disconnected, cancelled %s %s", scope["method"], scope["path"]
+                )
+            return
+        task.result()
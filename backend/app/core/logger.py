@@ -1,7 +1,144 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Optional
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger("DEUS-API")
+from core.config import settings
+
+LOGGER_NAME = "DEUS-API"
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Log args of these types are safe to format later on the listener thread
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_hooks_registered = False
+
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through only a fraction of records below WARNING"""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default implementation merges args into msg on the calling
+        # thread. Records stay in-process here, so primitive args are handed
+        # over untouched; mutable ones (dicts, lists, objects) are formatted
+        # now, or the listener could render state changed after the call.
+        # A lone dict arg becomes record.args itself, and is mutable too.
+        args = record.args
+        if isinstance(args, Mapping) or not all(
+            isinstance(value, _IMMUTABLE_TYPES) for value in args or ()
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    access_sample_rate: Optional[float] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background thread
+
+    Args:
+        level: Root log level name
+        fmt: "text" or "json"
+        access_sample_rate: Fraction of access log records to keep (0.0 - 1.0)
+    """
+    global _listener, _hooks_registered
+    if _listener is not None:
+        return _listener
+    if not _hooks_registered:
+        atexit.register(shutdown_logging)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _hooks_registered = True
+
+    level = level or settings.LOG_LEVEL
+    fmt = fmt or settings.LOG_FORMAT
+    if access_sample_rate is None:
+        access_sample_rate = settings.LOG_ACCESS_SAMPLE_RATE
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+    # High-frequency per-request messages go through their own sampled logger
+    access = logging.getLogger(f"{LOGGER_NAME}.access")
+    access.filters = [f for f in access.filters if not isinstance(f, SamplingFilter)]
+    access.addFilter(SamplingFilter(access_sample_rate))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_after_fork() -> None:
+    """Threads do not survive fork(): give each preloaded worker its own listener"""
+    global _listener
+    if _listener is not None:
+        _listener = None
+        setup_logging()
+
+
+# Handlers are installed by the entry point (main.py) calling setup_logging()
+logger = logging.getLogger(LOGGER_NAME)
+access_logger = logging.getLogger(f"{LOGGER_NAME}.access")
@@ -0,0 +1,212 @@
+import math
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import settings
+from core.logger import logger
+from core.redis import make_hash_tag, redis_manager
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+# Local state is pruned of expired entries once it grows past this many keys
+MAX_LOCAL_KEYS = 10000
+# Query values FastAPI (Pydantic) reads as booleans, compared case-insensitively
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "off"}
+
+
+class Limit(NamedTuple):
+    """At most `count` requests per `period` seconds"""
+    count: int
+    period: int
+
+
+class Rule(NamedTuple):
+    """Limit for one route, optionally only when some query params are set"""
+    name: str
+    method: str
+    path: str
+    params: Dict[str, str]
+    limit: Limit
+
+
+def parse_limit(value: str) -> Limit:
+    """Parse "5/minute" (or "5/minutes") into a Limit"""
+    count, _, unit = value.partition("/")
+    period = PERIODS.get(unit.strip().lower().rstrip("s"))
+    if period is None or not count.strip().isdigit() or int(count) < 1:
+        raise ValueError(f"Invalid rate limit {value!r}, expected e.g. '5/minute'")
+    return Limit(int(count), period)
+
+
+def query_value(value: Optional[str]) -> object:
+    """Query param value as compared by rules: booleans in any spelling match"""
+    if value is not None:
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+    return value
+
+
+def parse_rule(name: str, value: str) -> Rule:
+    """Parse a "GET /api/news/?force_refresh=true" route key and its limit"""
+    method, _, target = name.strip().partition(" ")
+    path, _, query = target.strip().partition("?")
+    params = dict(pair.split("=", 1) for pair in query.split("&") if "=" in pair)
+    return Rule(name, method.upper(), path, params, parse_limit(value))
+
+
+class RateLimiter:
+    """
+    Per-client GCRA limits shared by all workers through Redis
+
+    Rejections are remembered in-process until their Retry-After has passed,
+    so a client hammering a limited route costs no Redis round trip. If Redis
+    is unavailable, the same algorithm runs in-process (limits then apply per
+    worker).
+    """
+
+    def __init__(self):
+        self.default = parse_limit(settings.RATE_LIMIT_DEFAULT)
+        self.rules: List[Rule] = [
+            parse_rule(name, value) for name, value in settings.RATE_LIMIT_ROUTES.items()
+        ]
+        self.clients: Dict[str, Limit] = {
+            client: parse_limit(value) for client, value in settings.RATE_LIMIT_CLIENTS.items()
+        }
+        if settings.RATE_LIMIT_TRUSTED_HOPS < 1:
+            raise ValueError("RATE_LIMIT_TRUSTED_HOPS must be at least 1")
+        self.trusted_hops = settings.RATE_LIMIT_TRUSTED_HOPS
+        # key -> monotonic time until which requests are known to be rejected
+        self._blocked: Dict[str, float] = {}
+        # key -> theoretical arrival time, for the in-process fallback
+        self._tats: Dict[str, float] = {}
+
+    def get_client(self, request: Request) -> str:
+        """
+        Client identity: its IP, or the X-Forwarded-For entry behind a proxy
+
+        Each of the RATE_LIMIT_TRUSTED_HOPS proxies appends the address it
+        received the request from, so the client is that many entries from
+        the right. Entries further left are set by the client and ignored.
+        """
+        if settings.RATE_LIMIT_TRUST_PROXY:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                hops = [hop.strip() for hop in forwarded.split(",")]
+                return hops[max(len(hops) - self.trusted_hops, 0)]
+        return request.client.host if request.client else "unknown"
+
+    def get_limits(self, request: Request, client: str) -> List[Tuple[str, Limit]]:
+        """(name, limit) pairs that apply to a request, most specific first"""
+        limits = [
+            (rule.name, rule.limit)
+            for rule in self.rules
+            if rule.method == request.method
+            and rule.path == request.url.path
+            and all(
+                query_value(request.query_params.get(k)) == query_value(v)
+                for k, v in rule.params.items()
+            )
+        ]
+        limits.append(("default", self.clients.get(client, self.default)))
+        return limits
+
+    async def check(self, request: Request) -> Optional[Tuple[Limit, float]]:
+        """
+        Count a request against every limit that applies to it
+
+        The limits are checked together: a request one of them rejects is not
+        counted against the others.
+
+        Returns:
+            (exceeded limit, retry_after seconds) if rejected, otherwise None
+        """
+        client = self.get_client(request)
+        # The client's keys share a hash tag so one script can update them all
+        limits = [
+            (f"ratelimit:{make_hash_tag(client)}:{name}", limit)
+            for name, limit in self.get_limits(request, client)
+        ]
+
+        # In-process pre-check: skip Redis while a rejection is still in force
+        now = time.monotonic()
+        for key, limit in limits:
+            blocked_until = self._blocked.get(key, 0.0)
+            if blocked_until > now:
+                return limit, blocked_until - now
+
+        result = await redis_manager.rate_limit(
+            [(key, limit.count, limit.period) for key, limit in limits]
+        )
+        if result is None:
+            result = self._check_local(limits, now)
+        exceeded, retry_after = result
+        if exceeded is None:
+            return None
+
+        key, limit = limits[exceeded]
+        self._block(key, now + retry_after)
+        logger.warning("🚦 Rate limit exceeded: %s (%s/%ss)", key, limit.count, limit.period)
+        return limit, retry_after
+
+    def _check_local(
+        self, limits: List[Tuple[str, Limit]], now: float
+    ) -> Tuple[Optional[int], float]:
+        """In-process GCRA, mirroring core.redis.GCRA_SCRIPT"""
+        new_tats = []
+        for index, (key, limit) in enumerate(limits):
+            interval = limit.period / limit.count
+            new_tat = max(self._tats.get(key, now), now) + interval
+            allow_at = new_tat - limit.count * interval
+            if now < allow_at:
+                return index, allow_at - now
+            new_tats.append(new_tat)
+        self._prune(self._tats, now)
+        for (key, _), new_tat in zip(limits, new_tats):
+            self._tats[key] = new_tat
+        return None, 0.0
+
+    def _block(self, key: str, until: float) -> None:
+        self._prune(self._blocked, time.monotonic())
+        self._blocked[key] = until
+
+    @staticmethod
+    def _prune(entries: Dict[str, float], now: float) -> None:
+        """Drop expired entries so one-off clients do not accumulate"""
+        if len(entries) >= MAX_LOCAL_KEYS:
+            for key in [key for key, until in entries.items() if until <= now]:
+                del entries[key]
+
+
+class RateLimitMiddleware:
+    """Reject /api requests over their rate limit with 429 and Retry-After"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.limiter = RateLimiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        rejection = await self.limiter.check(Request(scope))
+        if rejection is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit, retry_after = rejection
+        response = JSONResponse(
+            {"detail": "Too many requests"},
+            status_code=429,
+            headers={
+                "Retry-After": str(max(math.ceil(retry_after), 1)),
+                "X-RateLimit-Limit": f"{limit.count}/{limit.period}s",
+            },
+        )
+        await response(scope, receive, send)
@@ -1,57 +1,212 @@
 from redis import asyncio as aioredis
-from typing import Optional
+from redis.asyncio.cluster import ClusterNode
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import EqualJitterBackoff
+from redis.commands.core import AsyncScript
+from redis.exceptions import ConnectionError, TimeoutError
+from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
+import asyncio
 import json
+import math
 
+from core import deadline
+from core.config import settings
+from core.deadline import DeadlineExceeded
 from core.logger import logger
 
+# GCRA (generic cell rate algorithm): one key per client and limit holding the
+# theoretical arrival time (TAT) of the next request, in milliseconds.
+# KEYS: every limit a request counts against. ARGV: for each key in turn, its
+# emission interval (period / limit, whole ms) and burst, allowing `limit`
+# requests back to back. Every limit is checked before any is updated, so a
+# rejected request consumes none of them.
+# Returns {exceeded, retry_after_ms}: the 1-based index of the first limit
+# that rejected the request, or 0 if it was allowed.
+GCRA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local new_tats = {}
+for i, key in ipairs(KEYS) do
+    local interval = tonumber(ARGV[i * 2 - 1])
+    local burst = tonumber(ARGV[i * 2])
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then
+        tat = now
+    end
+    new_tats[i] = tat + interval
+    local allow_at = new_tats[i] - burst * interval
+    if now < allow_at then
+        return {i, allow_at - now}
+    end
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, new_tats[i], 'PX', math.ceil(new_tats[i] - now))
+end
+return {0, 0}
+"""
+
 
 class RedisManager:
     """Redis connection manager"""
     
     def __init__(self):
         self.redis: Optional[aioredis.Redis] = None
+        self.available: bool = False
         self._url: Optional[str] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._gcra: Optional[AsyncScript] = None
     
     async def connect(self, url: str = None):
-        """Connect to Redis"""
-        from core.config import settings
+        """
+        Connect to Redis
         
+        Never raises: if Redis is unreachable the manager starts in degraded
+        mode and a background task keeps trying to reconnect.
+        """
         self._url = url or settings.REDIS_URL
         
-        try:
-            self.redis = await aioredis.from_url(
-                self._url,
-                encoding="utf-8",
-                decode_responses=settings.REDIS_DECODE_RESPONSES
+        self.redis = self._create_client(settings)
+        self._gcra = self.redis.register_script(GCRA_SCRIPT)
+        
+        await self._ping()
+        if self.available:
+            logger.info("✅ Redis connected (%s mode)", settings.REDIS_MODE)
+        else:
+            logger.warning("⚠️  Redis unavailable, running without cache")
+        
+        self._monitor_task = asyncio.create_task(self._monitor())
+    
+    def _create_client(self, settings) -> aioredis.Redis:
+        """Build the client for the configured topology"""
+        retry = Retry(
+            EqualJitterBackoff(cap=1.0, base=0.05),
+            settings.REDIS_RETRY_ATTEMPTS,
+        )
+        connection_kwargs = {
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT,
+            "socket_keepalive": True,
+            "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+            "encoding": "utf-8",
+            "decode_responses": settings.REDIS_DECODE_RESPONSES,
+            "password": settings.REDIS_PASSWORD or None,
+            "retry": retry,
+            "retry_on_error": [ConnectionError, TimeoutError],
+        }
+        
+        if settings.REDIS_MODE == "cluster":
+            return aioredis.RedisCluster(
+                startup_nodes=[
+                    ClusterNode(host, port)
+                    for host, port in parse_nodes(settings.REDIS_CLUSTER_NODES)
+                ],
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                **connection_kwargs,
             )
-            # Test connection
-            await self.redis.ping()
-            logger.info(f"✅ Redis connected: {settings.REDIS_HOST}:{settings.REDIS_PORT}")
-        except Exception as e:
-            logger.error(f"❌ Redis connection failed: {e}")
-            self.redis = None
-            raise
+        
+        if settings.REDIS_MODE == "sentinel":
+            sentinel = Sentinel(
+                parse_nodes(settings.REDIS_SENTINEL_NODES),
+                sentinel_kwargs={"socket_timeout": settings.REDIS_SOCKET_TIMEOUT},
+                **connection_kwargs,
+            )
+            return sentinel.master_for(
+                settings.REDIS_SENTINEL_MASTER,
+                db=settings.REDIS_DB,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+            )
+        
+        # Blocking pool: under contention callers wait for a free connection
+        # instead of failing with "Too many connections". Retries are a
+        # property of the pooled connections, so they go to the pool too.
+        connection_kwargs.pop("password")
+        pool = aioredis.BlockingConnectionPool.from_url(
+            self._url,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            **connection_kwargs,
+        )
+        return aioredis.Redis(connection_pool=pool)
+    
+    @property
+    def is_cluster(self) -> bool:
+        return isinstance(self.redis, aioredis.RedisCluster)
     
     async def disconnect(self):
         """Disconnect from Redis"""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        
         if self.redis:
-            await self.redis.close()
+            if self.is_cluster:
+                await self.redis.aclose()
+            else:
+                await self.redis.aclose(close_connection_pool=True)
+            self.redis = None
+            self.available = False
             logger.info("👋 Redis disconnected")
     
+    async def _ping(self) -> bool:
+        """Ping Redis and update availability"""
+        try:
+            await self.redis.ping()
+        except Exception as e:
+            if self.available:
+                logger.error("❌ Redis connection lost: %s", e)
+            self.available = False
+        else:
+            if not self.available and self._monitor_task:
+                logger.info("✅ Redis reconnected")
+            self.available = True
+        return self.available
+    
+    async def _monitor(self):
+        """Periodically check Redis, backing off while it is down"""
+        delay = settings.REDIS_RECONNECT_INTERVAL
+        while True:
+            await asyncio.sleep(delay)
+            if await self._ping():
+                delay = settings.REDIS_RECONNECT_INTERVAL
+            else:
+                delay = min(delay * 2, settings.REDIS_RECONNECT_MAX_INTERVAL)
+    
+    @asynccontextmanager
+    async def _deadline(self):
+        """Bound a command by its share of the request's remaining time"""
+        try:
+            async with asyncio.timeout(deadline.budget(settings.DEADLINE_REDIS_SHARE)):
+                yield
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("request deadline reached") from None
+    
+    def _on_error(self, e: Exception):
+        """Switch to degraded mode on connection-level failures"""
+        if isinstance(e, (ConnectionError, TimeoutError)):
+            self.available = False
+    
     async def get(self, key: str) -> Optional[str]:
         """Get value from Redis"""
-        if not self.redis:
+        if not self.available:
             return None
         
         try:
-            value = await self.redis.get(key)
-            if value:
-                logger.debug(f"✅ Cache HIT: {key}")
-            else:
-                logger.debug(f"❌ Cache MISS: {key}")
-            return value
+            async with self._deadline():
+                value = await self.redis.get(key)
+                if value:
+                    logger.debug("✅ Cache HIT: %s", key)
+                else:
+                    logger.debug("❌ Cache MISS: %s", key)
+                return value
         except Exception as e:
-            logger.error(f"❌ Redis GET error: {e}")
+            logger.error("❌ Redis GET error: %s", e)
+            self._on_error(e)
             return None
     
     async def set(
@@ -61,28 +216,207 @@ class RedisManager:
         ttl: int = 300
     ) -> bool:
         """Set value in Redis with TTL"""
-        if not self.redis:
+        if not self.available:
+            return False
+        
+        try:
+            async with self._deadline():
+                await self.redis.setex(key, ttl, value)
+                logger.debug("✅ Cache SET: %s (TTL: %ss)", key, ttl)
+                return True
+        except Exception as e:
+            logger.error("❌ Redis SET error: %s", e)
+            self._on_error(e)
+            return False
+    
+    async def set_if_missing(self, key: str, value: str, ttl: int = 300) -> bool:
+        """Set value with TTL only if the key does not exist (SET NX)"""
+        if not self.available:
+            return False
+        
+        try:
+            async with self._deadline():
+                return bool(await self.redis.set(key, value, ex=ttl, nx=True))
+        except Exception as e:
+            logger.error("❌ Redis SET NX error: %s", e)
+            self._on_error(e)
+            return False
+    
+    async def set_many(self, mapping: dict, ttl: int = 300) -> bool:
+        """Set several values with the same TTL in one pipeline"""
+        if not self.available:
+            return False
+        
+        try:
+            async with self._deadline():
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.setex(key, ttl, value)
+                    await pipe.execute()
+                logger.debug("✅ Cache SET: %s keys (TTL: %ss)", len(mapping), ttl)
+                return True
+        except Exception as e:
+            logger.error("❌ Redis SET error: %s", e)
+            self._on_error(e)
+            return False
+    
+    async def get_hash(self, key: str) -> Optional[dict]:
+        """
+        Get all fields of a hash
+        
+        Returns:
+            The fields ({} if the hash does not exist), or None if the lookup
+            failed (Redis unavailable, error or deadline)
+        """
+        if not self.available:
+            return None
+        
+        try:
+            async with self._deadline():
+                return await self.redis.hgetall(key)
+        except Exception as e:
+            logger.error("❌ Redis HGETALL error: %s", e)
+            self._on_error(e)
+            return None
+    
+    async def set_hash(self, key: str, mapping: dict) -> bool:
+        """Set several fields of a hash"""
+        if not self.available:
             return False
         
         try:
-            await self.redis.setex(key, ttl, value)
-            logger.debug(f"✅ Cache SET: {key} (TTL: {ttl}s)")
-            return True
+            async with self._deadline():
+                await self.redis.hset(key, mapping=mapping)
+                return True
         except Exception as e:
-            logger.error(f"❌ Redis SET error: {e}")
+            logger.error("❌ Redis HSET error: %s", e)
+            self._on_error(e)
             return False
     
+    async def append_stream(self, key: str, fields: dict, maxlen: int) -> Optional[str]:
+        """Append an entry to a stream capped at roughly maxlen entries"""
+        if not self.available:
+            return None
+        
+        try:
+            async with self._deadline():
+                return await self.redis.xadd(key, fields, maxlen=maxlen, approximate=True)
+        except Exception as e:
+            logger.error("❌ Redis XADD error: %s", e)
+            self._on_error(e)
+            return None
+    
+    async def stream_range(
+        self,
+        key: str,
+        start: str = "-",
+        end: str = "+",
+        count: Optional[int] = None,
+        reverse: bool = False
+    ) -> Optional[list]:
+        """
+        Get stream entries as (id, fields) pairs, newest first if reverse
+        
+        Returns:
+            The entries ([] if there are none), or None if the lookup failed
+            (Redis unavailable, error or deadline)
+        """
+        if not self.available:
+            return None
+        
+        try:
+            async with self._deadline():
+                if reverse:
+                    return await self.redis.xrevrange(key, max=end, min=start, count=count)
+                return await self.redis.xrange(key, min=start, max=end, count=count)
+        except Exception as e:
+            logger.error("❌ Redis XRANGE error: %s", e)
+            self._on_error(e)
+            return None
+    
+    async def rate_limit(
+        self,
+        limits: List[Tuple[str, int, float]]
+    ) -> Optional[Tuple[Optional[int], float]]:
+        """
+        Count a request against GCRA limits shared by every worker
+        
+        The limits are checked and updated in one script: a request rejected
+        by any of them is counted against none. In cluster mode the keys must
+        share a hash tag.
+        
+        Args:
+            limits: (key, limit, period seconds) for each limit
+        
+        Returns:
+            (index of the first exceeded limit or None, retry_after seconds),
+            or None when Redis is unavailable
+        """
+        if not self.available:
+            return None
+        
+        args = []
+        for _, limit, period in limits:
+            args.extend((math.ceil(period * 1000 / limit), limit))
+        try:
+            async with self._deadline():
+                exceeded, retry_after_ms = await self._gcra(
+                    keys=[key for key, _, _ in limits], args=args
+                )
+                return (exceeded - 1 if exceeded else None), retry_after_ms / 1000
+        except Exception as e:
+            logger.error("❌ Redis rate limit error: %s", e)
+            self._on_error(e)
+            return None
+    
+    async def incr_many(
+        self,
+        keys: list,
+        ttl: Optional[int] = None,
+        start: Optional[int] = None
+    ) -> list:
+        """
+        Increment several counters in one pipeline, returning the new values
+        
+        Args:
+            keys: Counters to increment
+            ttl: Expiry (seconds) to (re)set on every counter
+            start: Value a missing counter starts from instead of 0
+        """
+        if not self.available or not keys:
+            return []
+        
+        commands = 1 + (start is not None) + (ttl is not None)
+        try:
+            async with self._deadline():
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        if start is not None:
+                            pipe.set(key, start, nx=True)
+                        pipe.incr(key)
+                        if ttl is not None:
+                            pipe.expire(key, ttl)
+                    results = await pipe.execute()
+                # Keep only the INCR replies
+                return results[int(start is not None)::commands]
+        except Exception as e:
+            logger.error("❌ Redis INCR error: %s", e)
+            self._on_error(e)
+            return []
+    
     async def delete(self, key: str) -> bool:
         """Delete key from Redis"""
-        if not self.redis:
+        if not self.available:
             return False
         
         try:
-            await self.redis.delete(key)
-            logger.debug(f"🗑️  Cache DELETE: {key}")
-            return True
+            async with self._deadline():
+                await self.redis.delete(key)
+                logger.debug("🗑️  Cache DELETE: %s", key)
+                return True
         except Exception as e:
-            logger.error(f"❌ Redis DELETE error: {e}")
+            logger.error("❌ Redis DELETE error: %s", e)
+            self._on_error(e)
             return False
     
     async def get_json(self, key: str) -> Optional[dict]:
@@ -92,7 +426,7 @@ class RedisManager:
             try:
                 return json.loads(value)
             except json.JSONDecodeError:
-                logger.error(f"❌ Invalid JSON in cache: {key}")
+                logger.error("❌ Invalid JSON in cache: %s", key)
                 return None
         return None
     
@@ -107,31 +441,91 @@ class RedisManager:
             json_str = json.dumps(value)
             return await self.set(key, json_str, ttl)
         except Exception as e:
-            logger.error(f"❌ JSON serialization error: {e}")
+            logger.error("❌ JSON serialization error: %s", e)
             return False
     
     async def get_ttl(self, key: str) -> int:
         """Get remaining TTL for key"""
-        if not self.redis:
+        if not self.available:
             return -1
         
         try:
-            return await self.redis.ttl(key)
+            async with self._deadline():
+                return await self.redis.ttl(key)
         except Exception as e:
-            logger.error(f"❌ Redis TTL error: {e}")
+            logger.error("❌ Redis TTL error: %s", e)
+            self._on_error(e)
             return -1
     
-    async def keys(self, pattern: str = "*") -> list:
-        """Get all keys matching pattern"""
-        if not self.redis:
+    async def get_with_ttl(self, key: str) -> Tuple[Optional[str], int]:
+        """Get value and remaining TTL in a single round trip"""
+        if not self.available:
+            return None, -1
+        
+        try:
+            async with self._deadline():
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    value, ttl = await pipe.get(key).ttl(key).execute()
+                return value, ttl
+        except Exception as e:
+            logger.error("❌ Redis GET error: %s", e)
+            self._on_error(e)
+            return None, -1
+    
+    async def keys(self, pattern: str = "*", hash_tag: Optional[str] = None) -> list:
+        """
+        Get all keys matching pattern
+        
+        Uses SCAN rather than KEYS so it neither blocks the server nor breaks on
+        Redis Cluster. With a hash tag only the node owning that slot is scanned,
+        otherwise every primary is.
+        """
+        if not self.available:
             return []
         
+        scan_kwargs = {"match": pattern, "count": 500}
+        if hash_tag and self.is_cluster:
+            scan_kwargs["target_nodes"] = self.redis.get_node_from_key(
+                make_hash_tag(hash_tag)
+            )
+        
         try:
-            return await self.redis.keys(pattern)
+            async with self._deadline():
+                return [key async for key in self.redis.scan_iter(**scan_kwargs)]
         except Exception as e:
-            logger.error(f"❌ Redis KEYS error: {e}")
+            logger.error("❌ Redis SCAN error: %s", e)
+            self._on_error(e)
             return []
+    
+    async def delete_many(self, keys: list) -> int:
+        """Delete keys, batching per slot on Redis Cluster"""
+        if not self.available or not keys:
+            return 0
+        
+        try:
+            async with self._deadline():
+                deleted = await self.redis.delete(*keys)
+                logger.debug("🗑️  Cache DELETE: %s keys", deleted)
+                return deleted
+        except Exception as e:
+            logger.error("❌ Redis DELETE error: %s", e)
+            self._on_error(e)
+            return 0
+
+
+def make_hash_tag(value: str) -> str:
+    """Wrap value in braces so every key containing it maps to the same slot"""
+    return f"{{{value}}}"
+
 
+def parse_nodes(value: str) -> List[Tuple[str, int]]:
+    """Parse "host1:port1,host2:port2" into (host, port) pairs"""
+    nodes = []
+    for node in value.split(","):
+        if node.strip():
+            host, _, port = node.strip().rpartition(":")
+            nodes.append((host, int(port)))
+    return nodes
 
 # Global Redis manager instance
 redis_manager = RedisManager()
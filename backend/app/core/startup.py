@@ -0,0 +1,103 @@
+"""
+Cold start timing
+
+main.py imports this module first, so offsets are measured from the moment
+the application code starts loading (interpreter startup is not included).
+
+Usage:
+    python -m core.startup [--budget SECONDS]
+
+Starts a fresh uvicorn process, polls /health until it answers and exits
+non-zero if that took longer than the budget.
+"""
+import json
+import os
+import sys
+import time
+from typing import Dict
+
+_started = time.perf_counter()
+
+# Seconds from process start to the first /health answer
+STARTUP_BUDGET = 2.0
+
+# Seconds since startup at which each phase completed: "import", "ready", "first_health"
+timings: Dict[str, float] = {}
+
+
+def mark(phase: str) -> float:
+    """Record when a startup phase completed (only the first call counts)"""
+    if phase not in timings:
+        timings[phase] = round(time.perf_counter() - _started, 4)
+        if phase == "first_health":
+            # Imported here: the logger must not be configured as a side effect of timing
+            from core.logger import logger
+
+            logger.info("⏱️  Startup timings (s): %s", timings)
+    return timings[phase]
+
+
+def _free_port() -> int:
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(timeout: float = 30.0) -> Dict[str, float]:
+    """Start the app in a fresh process and time it until /health answers"""
+    # Only the CLI needs these; the app imports this module on its critical path
+    import subprocess
+
+    import httpx
+
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0)
+            except httpx.TransportError:
+                time.sleep(0.01)
+                continue
+            report = dict(response.json().get("startup", {}))
+            report["total"] = round(time.perf_counter() - started, 4)
+            return report
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure cold start up to the first /health")
+    parser.add_argument(
+        "--budget", type=float, default=STARTUP_BUDGET, help="Maximum seconds allowed"
+    )
+    args = parser.parse_args()
+
+    report = measure()
+    print(json.dumps(report))
+    if report["total"] > args.budget:
+        print(
+            f"Cold start took {report['total']}s, over the {args.budget}s budget",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+from uvicorn_worker import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools"""
+
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "access_log": False,
+    }
@@ -0,0 +1,54 @@
+"""
+Gunicorn configuration for production
+
+Usage:
+    gunicorn -c gunicorn_conf.py main:app
+"""
+import math
+import os
+
+from core.config import settings
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may use, honouring affinity and cgroup quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 quota, e.g. "200000 100000" for 2 CPUs or "max 100000"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(cpus, 1)
+
+
+# ===== Server socket =====
+bind = f"0.0.0.0:{settings.SERVER_PORT}"
+backlog = 2048
+
+# ===== Workers =====
+# Async workers are CPU bound once I/O is overlapped: one per core is enough
+workers = settings.WEB_CONCURRENCY or available_cpus()
+worker_class = "core.workers.ProductionWorker"
+keepalive = settings.SERVER_KEEPALIVE
+
+# Import the app once in the master and fork workers from it
+preload_app = True
+
+# ===== Worker recycling =====
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = settings.WORKER_MAX_REQUESTS_JITTER
+timeout = settings.WORKER_TIMEOUT
+graceful_timeout = settings.WORKER_GRACEFUL_TIMEOUT
+
+# ===== Logging =====
+accesslog = None
+errorlog = "-"
+loglevel = settings.LOG_LEVEL.lower()
@@ -1,10 +1,18 @@
+from core import startup  # First, so its clock covers the imports below
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from core.config import settings
-from core.logger import logger
+from core.deadline import DeadlineMiddleware
+from core.logger import access_logger, logger, setup_logging
+from core.rate_limit import RateLimitMiddleware
 from core.redis import redis_manager
+from services.image_service import image_service
+from services.news_service import news_service
+
+setup_logging()
 
 # ===== Lifespan Events =====
 @asynccontextmanager
@@ -12,17 +20,25 @@ async def lifespan(app: FastAPI):
     """Manage application startup and shutdown"""
     # Startup
     logger.info("🚀 Starting News Dashboard API...")
+    if settings.DEBUG:
+        logger.info(
+            "📋 Loaded settings: APP_VERSION=%s, POSTGRES_HOST=%s, REDIS_HOST=%s, "
+            "CACHE_TTL_NEWS=%ss",
+            settings.APP_VERSION, settings.POSTGRES_HOST, settings.REDIS_HOST,
+            settings.CACHE_TTL_NEWS,
+        )
     
-    # Connect to Redis
+    # Connect to Redis (degrades to uncached mode if unavailable)
     await redis_manager.connect()
-    logger.info("✅ Redis connected")
+    startup.mark("ready")
     
     yield
     
     # Shutdown
     logger.info("👋 Shutting down...")
+    await news_service.close()
+    await image_service.close()
     await redis_manager.disconnect()
-    logger.info("✅ Redis disconnected")
 
 # ===== FastAPI Application =====
 app = FastAPI(
@@ -34,6 +50,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# ===== Rate Limiting Middleware =====
+# Added before CORS so 429 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# ===== Deadline Middleware =====
+# Outside rate limiting, so its Redis calls are bounded by the deadline too
+app.add_middleware(DeadlineMiddleware)
+
 # ===== CORS Middleware =====
 app.add_middleware(
     CORSMiddleware,
@@ -41,8 +66,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
-logger.info(f"✅ CORS enabled for: {settings.get_cors_origins}")
+logger.info("✅ CORS enabled for: %s", settings.get_cors_origins)
 
 # ===== Health Check Endpoints =====
 @app.get("/", tags=["Health"])
@@ -59,7 +85,7 @@ async def root():
 @app.get("/ping", tags=["Health"])
 async def ping():
     """Simple health check endpoint"""
-    logger.info("Ping endpoint called")
+    access_logger.info("Ping endpoint called")
     return {
         "status": "ok",
         "message": "pong"
@@ -68,22 +94,27 @@ async def ping():
 @app.get("/health", tags=["Health"])
 async def health():
     """Detailed health check with Redis status"""
-    redis_status = "connected" if redis_manager.redis else "disconnected"
+    redis_status = "connected" if redis_manager.available else "disconnected"
     
     health_info = {
         "status": "healthy" if redis_status == "connected" else "degraded",
         "api": "running",
         "redis": redis_status,
         "version": settings.APP_VERSION,
-        "environment": "development" if settings.DEBUG else "production"
+        "environment": "development" if settings.DEBUG else "production",
+        "startup": startup.timings,
     }
+    startup.mark("first_health")
     
-    logger.info(f"Health check: {health_info}")
+    access_logger.info("Health check: %s", health_info)
     return health_info
 
 # ===== Include Routers =====
 # TODO: Uncomment when news router is ready
 from routers import news
 app.include_router(news.router, prefix="/api/news", tags=["News"])
+from routers import item_router
+app.include_router(item_router, prefix="/api")
 
-logger.info("✅ API routers registered")
\ No newline at end of file
+logger.info("✅ API routers registered")
+logger.info("⏱️  Imported in %.3fs", startup.mark("import"))
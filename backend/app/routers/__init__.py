@@ -1,2 +1,7 @@
-from routers.item import router as item_router
+def __getattr__(name):
+    # Imported on first use so the news routes do not pull in SQLAlchemy
+    if name == "item_router":
+        from routers.item import router as item_router
 
+        return item_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
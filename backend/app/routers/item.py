@@ -1,20 +1,61 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, List, Optional
+
+from fastapi import APIRouter, Depends, Query
 
 from core.database import get_db
-from schemas.item import ItemCreate, ItemRead
-from services.item import ItemService
+from schemas.item import ItemBulkUpdate, ItemCreate, ItemRead
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from services.item import ItemService
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
+def _service(db: "Session") -> "ItemService":
+    # Imported on first request so mounting these routes does not load SQLAlchemy
+    from services.item import ItemService
+
+    return ItemService(db)
+
+
 @router.post("/", response_model=ItemRead)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
-    service = ItemService(db)
+def create_item(item: ItemCreate, db: "Session" = Depends(get_db)):
+    service = _service(db)
     return service.create_item(item)
 
 
+@router.get("/", response_model=List[ItemRead])
+def list_items(
+    limit: int = Query(100, ge=1, le=1000),
+    after: Optional[int] = Query(None, description="Last ID of the previous page"),
+    db: "Session" = Depends(get_db),
+):
+    service = _service(db)
+    return service.list_items(limit=limit, after=after)
+
+
+@router.post("/bulk", response_model=List[ItemRead])
+def bulk_create_items(items: List[ItemCreate], db: "Session" = Depends(get_db)):
+    service = _service(db)
+    return service.bulk_create(items)
+
+
+@router.patch("/bulk", response_model=dict)
+def bulk_update_items(items: List[ItemBulkUpdate], db: "Session" = Depends(get_db)):
+    service = _service(db)
+    updated = service.bulk_update([item.dict(exclude_unset=True) for item in items])
+    return {"updated": updated}
+
+
+@router.get("/batch", response_model=List[ItemRead])
+def read_items(ids: List[int] = Query(..., max_length=1000), db: "Session" = Depends(get_db)):
+    service = _service(db)
+    return service.get_many(ids)
+
+
 @router.get("/{item_id}", response_model=ItemRead)
-def read_item(item_id: int, db: Session = Depends(get_db)):
-    service = ItemService(db)
+def read_item(item_id: int, db: "Session" = Depends(get_db)):
+    service = _service(db)
     return service.get_item(item_id)
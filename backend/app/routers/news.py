@@ -1,17 +1,28 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, Response
 from typing import Optional
+import msgspec
 
 from schemas.news import (
     NewsResponse,
+    NewsChangesResponse,
     CacheRefreshRequest,
     CacheRefreshResponse,
     CacheMetrics,
 )
+from services.image_service import ImageFetchError, image_service
 from services.news_service import news_service
-from core.logger import logger
+from core.logger import access_logger, logger
 
 router = APIRouter()
 
+_encoder = msgspec.json.Encoder()
+
+
+def _json_response(payload) -> Response:
+    """Encode an internal msgspec payload directly, skipping Pydantic validation"""
+    return Response(content=_encoder.encode(payload), media_type="application/json")
+
 
 @router.get("/", response_model=NewsResponse)
 async def get_news(
@@ -29,16 +40,44 @@ async def get_news(
     - **force_refresh**: true to ignore cache and get fresh data
     """
     try:
-        logger.info(f"GET /api/news/ - category={category}, page={page}, force_refresh={force_refresh}")
+        access_logger.info(
+            "GET /api/news/ - category=%s, page=%s, force_refresh=%s",
+            category, page, force_refresh,
+        )
         news_response = await news_service.get_news(
             category=category,
             page=page,
             page_size=page_size,
             force_refresh=force_refresh
         )
-        return news_response
+        return _json_response(news_response)
     except Exception as e:
-        logger.error(f"Error getting news: {e}")
+        logger.error("Error getting news: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/changes", response_model=NewsChangesResponse)
+async def get_news_changes(
+    category: str = Query("technology", description="News category"),
+    since: Optional[str] = Query(None, description="Sync token from the previous call"),
+    page_size: int = Query(5, ge=1, le=20, description="Articles in a full snapshot"),
+):
+    """
+    Get only the articles added or removed since the last sync
+    
+    - **category**: News category
+    - **since**: Token returned by the previous call (omit for a full snapshot)
+    - **page_size**: Number of articles when a full snapshot is returned
+    """
+    try:
+        changes = await news_service.get_changes(
+            category=category,
+            since=since,
+            page_size=page_size
+        )
+        return _json_response(changes)
+    except Exception as e:
+        logger.error("Error getting news changes: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -70,14 +109,14 @@ async def refresh_cache(request: CacheRefreshRequest):
         else:
             message = "All news cache invalidated"
         
-        logger.info(f"Cache refresh: {message} ({deleted_count} keys deleted)")
+        logger.info("Cache refresh: %s (%s keys deleted)", message, deleted_count)
         
         return CacheRefreshResponse(
             message=message,
             keys_deleted=deleted_count
         )
     except Exception as e:
-        logger.error(f"Error refreshing cache: {e}")
+        logger.error("Error refreshing cache: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -86,7 +125,36 @@ async def get_cache_metrics():
     """
     Get cache performance metrics
     
-    Returns statistics about cache hits, misses, and hit rate
+    Returns statistics about cache hits, misses, hit rate, the adaptive TTL
+    chosen per category and the upstream calls it saved
     """
-    metrics = news_service.get_metrics()
+    metrics = await news_service.get_metrics()
     return CacheMetrics(**metrics)
+
+
+@router.get("/image/{article_id}", response_class=FileResponse)
+async def get_article_image(
+    article_id: str,
+    w: Optional[int] = Query(None, ge=16, le=4096, description="Requested width in pixels"),
+):
+    """
+    Get a resized, cached copy of an article image
+    
+    - **article_id**: Article ID from a news response
+    - **w**: Desired width, rounded up to the nearest thumbnail size
+    """
+    try:
+        path = await image_service.get_thumbnail(article_id, w)
+    except ImageFetchError as e:
+        logger.error("Error proxying image: %s", e)
+        raise HTTPException(status_code=502, detail="Image unavailable")
+    
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # Proxied URLs carry a version derived from the origin URL, so never change
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
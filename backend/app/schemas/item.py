@@ -12,6 +12,15 @@ class ItemCreate(ItemBase):
     pass
 
 
+class ItemUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+
+class ItemBulkUpdate(ItemUpdate):
+    id: int
+
+
 class ItemRead(ItemBase):
     id: int
 
@@ -1,8 +1,57 @@
+import msgspec
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 
+# ===== Internal representation =====
+# Compact msgspec structs carry articles from ingestion through the cache to
+# the response encoder; the Pydantic models below only describe the API.
+
+class Article(msgspec.Struct, kw_only=True, gc=False):
+    """Internal news article"""
+    id: str
+    title: str
+    description: Optional[str] = None
+    content: Optional[str] = None
+    url: str
+    image_url: Optional[str] = None
+    published_at: str
+    source: str
+    author: Optional[str] = None
+    category: str
+    related_count: int = 0  # Near-duplicates from other sources folded into this one
+
+
+class CachedNews(msgspec.Struct, gc=False):
+    """Cached page of articles"""
+    articles: List[Article]
+    total_results: int
+
+
+class NewsPayload(msgspec.Struct, gc=False):
+    """Internal counterpart of NewsResponse"""
+    articles: List[Article]
+    total_results: int
+    from_cache: bool
+    cache_ttl: Optional[int]
+    category: str
+    degraded: bool = False
+
+
+class NewsChangesPayload(msgspec.Struct, gc=False):
+    """Internal counterpart of NewsChangesResponse"""
+    category: str
+    token: str
+    reset: bool
+    added: List[Article]
+    removed: List[str]
+    degraded: bool = False
+
+
+# ===== API schemas =====
+
+
 class NewsArticle(BaseModel):
     """News article model"""
     id: str = Field(..., description="Unique article ID")
@@ -15,6 +64,7 @@ class NewsArticle(BaseModel):
     source: str = Field(..., description="News source")
     author: Optional[str] = Field(None, description="Article author")
     category: str = Field(..., description="News category")
+    related_count: int = Field(0, description="Near-duplicate stories folded into this one")
 
 
 class NewsResponse(BaseModel):
@@ -24,6 +74,21 @@ class NewsResponse(BaseModel):
     from_cache: bool = Field(..., description="Whether data came from cache")
     cache_ttl: Optional[int] = Field(None, description="Remaining cache TTL (seconds)")
     category: str = Field(..., description="Queried category")
+    degraded: bool = Field(
+        False, description="True if the request deadline cut the fetch short (result not cached)"
+    )
+
+
+class NewsChangesResponse(BaseModel):
+    """Articles added or removed since a sync token"""
+    category: str = Field(..., description="Queried category")
+    token: str = Field(..., description="Sync token to send as `since` next time")
+    reset: bool = Field(
+        ..., description="True if `added` is a full snapshot to replace local state"
+    )
+    added: List[NewsArticle] = Field(..., description="New or updated articles")
+    removed: List[str] = Field(..., description="IDs of articles no longer listed")
+    degraded: bool = Field(False, description="True if the request deadline cut the fetch short")
 
 
 class CacheRefreshRequest(BaseModel):
@@ -44,3 +109,9 @@ class CacheMetrics(BaseModel):
     misses: int = Field(..., description="Number of cache misses")
     total_requests: int = Field(..., description="Total requests")
     hit_rate_percent: float = Field(..., description="Hit rate percentage")
+    adaptive_ttls: Dict[str, int] = Field(
+        default_factory=dict, description="Current cache TTL (seconds) per 'category:page_size'"
+    )
+    upstream_calls_saved: float = Field(
+        0, description="Upstream calls avoided vs. the fixed CACHE_TTL_NEWS (negative = extra)"
+    )
@@ -1,15 +1,22 @@
-from typing import Dict, List, Type, TypeVar
+from typing import Any, Dict, List, Sequence, Type, TypeVar
 
 from fastapi import HTTPException
 from pydantic import BaseModel
+from sqlalchemy import insert, select, update
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.sql import text
 
 from core.logger import logger
 
 ModelType = TypeVar("ModelType")
 
+# Rows per INSERT statement; keeps bind parameters under SQLite/Postgres limits
+BULK_BATCH_SIZE = 500
+# IDs per IN (...) lookup
+IN_BATCH_SIZE = 1000
+
 
 class BaseService:
     def __init__(self, db: Session, model: Type[ModelType]) -> None:
@@ -38,10 +45,119 @@ class BaseService:
         logger.info(f"Created {self.model.__name__} with ID {pk_value}")
         return item
 
-    def list_items(self, order_by: str | None = None) -> List[ModelType]:
-        """Retrieve a list of all items, optionally ordered by a field."""
+    def bulk_create(
+        self, items_data: Sequence[BaseModel], batch_size: int = BULK_BATCH_SIZE
+    ) -> List[ModelType]:
+        """Create many items with multi-row INSERT ... RETURNING statements.
+
+        The rows are sent as one executemany, which SQLAlchemy renders as one
+        INSERT of ``batch_size`` rows per round trip; the statement is compiled
+        once rather than per batch. Items are returned in input order.
+        """
+        rows = [item_data.dict() for item_data in items_data]
+        items: List[ModelType] = []
+        if rows:
+            sort_by_pk = self._ids_follow_insert_order()
+            stmt = (
+                insert(self.model)
+                .returning(self.model, sort_by_parameter_order=not sort_by_pk)
+                .execution_options(insertmanyvalues_page_size=batch_size)
+            )
+            items = list(self.db.scalars(stmt, rows))
+            if sort_by_pk:
+                items.sort(key=lambda item: getattr(item, self.pk_name))
+        # Detach the new rows so the commit does not expire them: reading them
+        # back afterwards would otherwise cost one SELECT per row
+        for item in items:
+            self.db.expunge(item)
+        self.db.commit()
+        logger.info(f"Created {len(items)} {self.model.__name__}(s) in bulk")
+        return items
+
+    def _ids_follow_insert_order(self) -> bool:
+        """Whether new rows are put in input order by sorting them on the primary key.
+
+        SQLite cannot tie RETURNING rows to their parameters, so an ordered
+        RETURNING falls back to one INSERT per row there. Its autoincrement
+        IDs are assigned in VALUES order, so sorting on them is used instead.
+        """
+        table = self.model.__table__
+        return (
+            self.db.get_bind().dialect.name == "sqlite"
+            and table.autoincrement_column is not None
+            and table.autoincrement_column.name == self.pk_name
+        )
+
+    def bulk_update(self, items_data: Sequence[Dict[str, Any]]) -> int:
+        """Update many items by primary key in a single executemany UPDATE.
+
+        Each mapping must include the primary key; only the given fields change.
+        If any ID does not exist, nothing is updated and a 404 lists the missing IDs.
+        """
+        rows = list(items_data)
+        missing = [row for row in rows if row.get(self.pk_name) is None]
+        if missing:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Every {self.model.__name__} update needs '{self.pk_name}'",
+            )
+        if rows:
+            try:
+                self.db.execute(update(self.model), rows)
+            except StaleDataError:
+                # Some IDs matched no row: apply none of the updates
+                self.db.rollback()
+                requested = [row[self.pk_name] for row in rows]
+                found = {getattr(item, self.pk_name) for item in self.get_many(requested)}
+                missing_ids = [item_id for item_id in requested if item_id not in found]
+                logger.warning(f"{self.model.__name__} IDs {missing_ids} not found for update")
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"{self.model.__name__} with IDs {missing_ids} not found",
+                )
+            self.db.commit()
+        logger.info(f"Updated {len(rows)} {self.model.__name__}(s) in bulk")
+        return len(rows)
+
+    def get_many(self, item_ids: Sequence[int]) -> List[ModelType]:
+        """Retrieve several items by ID with one IN query per batch of IDs.
+
+        Missing IDs are skipped; results follow the order of ``item_ids``.
+        """
+        primary_key_field = getattr(self.model, self.pk_name)
+        unique_ids = list(dict.fromkeys(item_ids))
+        found: Dict[Any, ModelType] = {}
+        for start in range(0, len(unique_ids), IN_BATCH_SIZE):
+            stmt = select(self.model).where(
+                primary_key_field.in_(unique_ids[start : start + IN_BATCH_SIZE])
+            )
+            for item in self.db.scalars(stmt):
+                found[getattr(item, self.pk_name)] = item
+        logger.info(f"Retrieved {len(found)} {self.model.__name__}(s) by ID")
+        return [found[item_id] for item_id in unique_ids if item_id in found]
+
+    def list_items(
+        self,
+        order_by: str | None = None,
+        limit: int | None = None,
+        after: Any | None = None,
+    ) -> List[ModelType]:
+        """Retrieve a page of items, optionally ordered by a field.
+
+        ``after`` enables keyset pagination on the primary key: pass the last ID
+        of the previous page to get the next one. It cannot be combined with a
+        custom ``order_by``.
+        """
+        query = self.db.query(self.model)
+        if after is not None:
+            if order_by is not None:
+                raise ValueError("Keyset pagination ('after') requires primary key order")
+            query = query.filter(getattr(self.model, self.pk_name) > after)
         order_by = text(self.pk_name) if order_by is None else text(order_by)
-        items = self.db.query(self.model).order_by(order_by).all()
+        query = query.order_by(order_by)
+        if limit is not None:
+            query = query.limit(limit)
+        items = query.all()
         logger.info(f"Retrieved {len(items)} {self.model.__name__}(s)")
         return items
 
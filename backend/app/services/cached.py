@@ -0,0 +1,130 @@
+import json
+from datetime import date, datetime, time
+from time import time_ns
+from typing import Any, Dict, Sequence
+
+import anyio.from_thread
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.config import settings
+from core.logger import logger
+from core.redis import make_hash_tag, redis_manager
+from services.base import ModelType
+
+_ISO_TYPES = (datetime, date, time)
+# Version keys live this many times the entity TTL, outliving the data under them
+VERSION_TTL_FACTOR = 2
+
+
+def _call_redis(func, *args, default: Any = None) -> Any:
+    """Run a RedisManager coroutine from a sync route's worker thread.
+
+    Outside an AnyIO worker thread (scripts, the event loop itself) the cache is
+    skipped and ``default`` returned.
+    """
+    if not redis_manager.available:
+        return default
+    try:
+        return anyio.from_thread.run(func, *args)
+    except RuntimeError:
+        return default
+
+
+class CachedServiceMixin:
+    """Read-through Redis cache for BaseService entity lookups.
+
+    Mix in before BaseService. ``get_item`` results are cached per model and
+    primary key; ``update_item``, ``bulk_update`` and ``delete_item`` bump the
+    entity's version so a reader that loaded the row before the write can only
+    store it under a version nobody reads anymore.
+
+    A missing version key (never set, expired or evicted) is seeded from the
+    clock rather than restarted at 0, so versions never repeat and data stored
+    under an earlier one is never read again. The read that finds it missing
+    is not cached, as a write may bump the version while the row is loading.
+
+    The TTL is ``settings.CACHE_TTL_<MODEL>`` (e.g. ``CACHE_TTL_USER``) or
+    ``CACHE_TTL_DEFAULT``.
+    """
+
+    def _cache_ttl(self) -> int:
+        return getattr(
+            settings, f"CACHE_TTL_{self.model.__name__.upper()}", settings.CACHE_TTL_DEFAULT
+        )
+
+    def _version_ttl(self) -> int:
+        return self._cache_ttl() * VERSION_TTL_FACTOR
+
+    def _cache_prefix(self, item_id: Any) -> str:
+        # Version and data keys share a hash tag, so they stay on one cluster slot
+        return f"entity:{make_hash_tag(f'{self.model.__name__}:{item_id}')}"
+
+    def _serialize(self, item: ModelType) -> str:
+        data = {}
+        for attr in inspect(self.model).column_attrs:
+            value = getattr(item, attr.key)
+            data[attr.key] = value.isoformat() if isinstance(value, _ISO_TYPES) else value
+        return json.dumps(data)
+
+    def _deserialize(self, value: str) -> ModelType:
+        data = json.loads(value)
+        for attr in inspect(self.model).column_attrs:
+            column_type = attr.columns[0].type
+            python_type = getattr(column_type, "python_type", None)
+            if data.get(attr.key) is not None and python_type in _ISO_TYPES:
+                data[attr.key] = column_type.python_type.fromisoformat(data[attr.key])
+        # Attach as a persistent instance without querying the database
+        item = self.model(**data)
+        make_transient_to_detached(item)
+        return self.db.merge(item, load=False)
+
+    def get_item(self, item_id: int) -> ModelType:
+        """Retrieve a single item by its ID, reading through the Redis cache."""
+        prefix = self._cache_prefix(item_id)
+        version_key = f"{prefix}:version"
+        version = _call_redis(redis_manager.get, version_key)
+        if version is None:
+            _call_redis(
+                redis_manager.set_if_missing, version_key, str(time_ns()), self._version_ttl()
+            )
+            return super().get_item(item_id)
+        data_key = f"{prefix}:v{version}"
+
+        cached = _call_redis(redis_manager.get, data_key)
+        if cached:
+            logger.debug(f"Cache HIT: {data_key}")
+            return self._deserialize(cached)
+
+        item = super().get_item(item_id)
+        _call_redis(redis_manager.set, data_key, self._serialize(item), self._cache_ttl())
+        return item
+
+    def _invalidate(self, item_ids: Sequence[Any]) -> None:
+        """Bump entity versions and drop the data cached under the old ones."""
+        prefixes = [self._cache_prefix(item_id) for item_id in item_ids]
+        versions = _call_redis(
+            redis_manager.incr_many,
+            [f"{prefix}:version" for prefix in prefixes],
+            self._version_ttl(),
+            time_ns(),
+            default=[],
+        )
+        stale_keys = [f"{prefix}:v{version - 1}" for prefix, version in zip(prefixes, versions)]
+        _call_redis(redis_manager.delete_many, stale_keys)
+
+    def update_item(self, item_id: int, item_data) -> ModelType:
+        item = super().update_item(item_id, item_data)
+        self._invalidate([item_id])
+        return item
+
+    def bulk_update(self, items_data: Sequence[Dict[str, Any]]) -> int:
+        rows = list(items_data)
+        updated = super().bulk_update(rows)
+        self._invalidate([row[self.pk_name] for row in rows])
+        return updated
+
+    def delete_item(self, item_id: int) -> Dict[str, str]:
+        result = super().delete_item(item_id)
+        self._invalidate([item_id])
+        return result
@@ -0,0 +1,188 @@
+"""
+Near-duplicate story clustering
+
+Articles are reduced to MinHash signatures over word-bigram shingles of their
+title and description, then bucketed with LSH banding: two stories land in the
+same bucket of some band with high probability when their Jaccard similarity
+is above the threshold, so only bucket mates are ever compared. Everything is
+vectorized with NumPy, so the cost grows linearly with the number of articles
+instead of quadratically with the number of pairs.
+"""
+import re
+from typing import List, Optional, Sequence
+
+import msgspec
+import numpy as np
+
+from core.config import settings
+from schemas.news import Article
+
+_SEPARATOR = "\x00"
+_TOKEN_RE = re.compile(r"\w+|\x00")
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+# Upper bound on the (shingles x permutations) matrix built per chunk
+_CHUNK_CELLS = 1 << 22
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spread integer IDs into uniform 64-bit hashes"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class DedupService:
+    """Group near-duplicate articles and keep one representative per cluster"""
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        seed: int = 1,
+    ):
+        threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+        num_perm = num_perm or settings.DEDUP_NUM_PERM
+        bands = bands or settings.DEDUP_BANDS
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        # Multiply-add-shift hash family h(x) = (a * x + b) >> 32 over wrapping uint64,
+        # with a odd: one multiply per cell and no modulo
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, texts: Sequence[str]):
+        """
+        Hash the word bigrams of every text
+
+        Returns:
+            (hashes, starts, empty): 32-bit shingle hashes grouped by text, the
+            offset of each text's first shingle, and a mask of texts without words
+        """
+        # Tokenize the whole batch in one regex pass, texts separated by _SEPARATOR
+        corpus = _SEPARATOR.join(texts).lower()
+        if corpus.count(_SEPARATOR) != len(texts) - 1:
+            corpus = _SEPARATOR.join(text.replace(_SEPARATOR, " ") for text in texts).lower()
+        tokens = [_SEPARATOR, *_TOKEN_RE.findall(corpus), _SEPARATOR]
+
+        # Words are hashed with the built-in (per-process salted) hash: signatures
+        # are only ever compared within one call, never stored
+        ids = np.fromiter(map(hash, tokens), dtype=np.int64, count=len(tokens)).view(np.uint64)
+        separators = np.flatnonzero(ids == np.uint64(hash(_SEPARATOR) & 0xFFFFFFFFFFFFFFFF))
+
+        # Bigrams include the separators, so text i owns the bigrams between its
+        # leading and trailing separator and a wordless text still has one
+        hashes = _mix(_mix(ids[:-1]) * _GOLDEN ^ ids[1:]) & _MAX_HASH
+        starts = separators[:-1]
+        empty = np.diff(separators) == 1
+        return hashes, starts, empty
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """MinHash signatures, one row of num_perm uint32 values per text"""
+        hashes, starts, empty = self._shingles(texts)
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        bounds = np.append(starts, len(hashes))
+
+        doc = 0
+        max_shingles = max(_CHUNK_CELLS // self.num_perm, 1)
+        while doc < len(texts):
+            # Take as many whole texts as fit in one chunk (at least one)
+            end = np.searchsorted(bounds, bounds[doc] + max_shingles, side="right") - 1
+            end = min(max(end, doc + 1), len(texts))
+            chunk = hashes[bounds[doc]:bounds[end], None]
+            values = chunk * self._a
+            values += self._b
+            values >>= np.uint64(32)
+            signatures[doc:end] = np.minimum.reduceat(values, bounds[doc:end] - bounds[doc], axis=0)
+            doc = end
+
+        # Wordless texts would all match each other: give each a signature of its own
+        signatures[empty] = np.flatnonzero(empty).astype(np.uint32)[:, None]
+        return signatures
+
+    def cluster(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Label each signature with the index of its cluster's first member
+
+        Bucket mates are confirmed by their estimated Jaccard similarity
+        against the bucket's first member before being merged, and clusters
+        are closed transitively across bands.
+        """
+        count = len(signatures)
+        labels = np.arange(count)
+        if count < 2:
+            return labels
+
+        buckets = []
+        for band in range(self.bands):
+            columns = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            keys = columns[:, 0]
+            for column in range(1, self.rows):
+                keys = _mix(keys * _GOLDEN ^ columns[:, column])
+
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            new_bucket = np.empty(count, dtype=bool)
+            new_bucket[0] = True
+            np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=new_bucket[1:])
+            starts = np.flatnonzero(new_bucket)
+            sizes = np.diff(np.append(starts, count))
+            if (sizes == 1).all():
+                continue
+
+            heads = np.repeat(order[starts], sizes)
+            similarity = (signatures[order] == signatures[heads]).mean(axis=1)
+            confirmed = similarity >= self.threshold
+            buckets.append((order, starts, sizes, confirmed))
+
+        # Propagate the smallest label through confirmed bucket mates until stable
+        changed = bool(buckets)
+        while changed:
+            previous = labels.copy()
+            for order, starts, sizes, confirmed in buckets:
+                members = np.where(confirmed, labels[order], count)
+                smallest = np.repeat(np.minimum.reduceat(members, starts), sizes)
+                current = labels[order]
+                labels[order] = np.where(confirmed, np.minimum(current, smallest), current)
+            # Pointer jumping: follow labels to their own labels
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            changed = not np.array_equal(labels, previous)
+        return labels
+
+    def collapse(self, articles: List[Article]) -> List[Article]:
+        """
+        Keep the first article of each near-duplicate cluster
+
+        Order is preserved; representatives carry the number of stories
+        folded into them in related_count.
+        """
+        if len(articles) < 2:
+            return articles
+
+        texts = [f"{article.title} {article.description or ''}" for article in articles]
+        labels = self.cluster(self.signatures(texts))
+        sizes = np.bincount(labels, minlength=len(articles))
+
+        return [
+            msgspec.structs.replace(article, related_count=int(sizes[i]) - 1)
+            if sizes[i] > 1 else article
+            for i, article in enumerate(articles)
+            if labels[i] == i
+        ]
+
+
+# Global service instance
+dedup_service = DedupService()
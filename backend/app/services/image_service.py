@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from core.config import settings
+from core.logger import logger
+from core.redis import redis_manager
+from schemas.news import Article
+
+
+class ImageFetchError(Exception):
+    """Raised when an origin image cannot be fetched or decoded"""
+
+
+class ImageService:
+    """Fetch article images once, resize them and keep them in an on-disk LRU cache"""
+
+    def __init__(self):
+        self.cache_dir = Path(settings.IMAGE_CACHE_DIR)
+        self.max_bytes = settings.IMAGE_CACHE_MAX_BYTES
+        self.widths = sorted(settings.IMAGE_THUMBNAIL_WIDTHS)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(settings.IMAGE_FETCH_CONCURRENCY)
+        # path -> size, oldest first; loaded lazily from disk
+        self._index: Optional[OrderedDict] = None
+        self._total_bytes = 0
+        self._scanned_at = 0.0
+        self._scan_task: Optional[asyncio.Future] = None
+        # In-flight fetches by origin digest, so concurrent requests share one
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def _get_url_key(self, article_id: str) -> str:
+        """Redis key mapping an article ID to its origin image URL"""
+        return f"image:url:{article_id}"
+
+    def proxy_url(self, article_id: str, origin_url: str) -> str:
+        """Public URL of the proxied image, versioned by its origin URL"""
+        version = hashlib.sha256(origin_url.encode()).hexdigest()[:12]
+        return f"{settings.PUBLIC_BASE_URL}/api/news/image/{article_id}?v={version}"
+
+    async def register(self, articles: List[Article]) -> bool:
+        """
+        Remember origin image URLs so the proxy can resolve article IDs
+
+        Returns:
+            False if the mapping could not be stored (e.g. Redis is down): the
+            proxy would answer 404, so origin URLs must be served instead
+        """
+        mapping = {
+            self._get_url_key(article.id): article.image_url
+            for article in articles
+            if article.image_url
+        }
+        if not mapping:
+            return True
+        return await redis_manager.set_many(mapping, ttl=settings.IMAGE_URL_TTL)
+
+    def snap_width(self, width: Optional[int]) -> int:
+        """Round a requested width up to the nearest configured thumbnail width"""
+        if width is None:
+            return self.widths[len(self.widths) // 2]
+        for candidate in self.widths:
+            if candidate >= width:
+                return candidate
+        return self.widths[-1]
+
+    async def get_thumbnail(self, article_id: str, width: Optional[int] = None) -> Optional[Path]:
+        """
+        Get the path of a cached thumbnail, fetching and resizing it if needed
+
+        Returns:
+            Path to the JPEG on disk, or None if the article has no known image
+        """
+        origin_url = await redis_manager.get(self._get_url_key(article_id))
+        if not origin_url:
+            return None
+
+        width = self.snap_width(width)
+        digest = hashlib.sha256(origin_url.encode()).hexdigest()
+        path = self._get_path(digest, width)
+
+        await self._refresh_index()
+        if self._touch(path):
+            return path
+
+        pending = self._pending.get(digest)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_and_render(origin_url, digest))
+            self._pending[digest] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(digest, None))
+        await asyncio.shield(pending)
+        return path
+
+    def _get_path(self, digest: str, width: int) -> Path:
+        """Content-addressed location of a thumbnail"""
+        return self.cache_dir / digest[:2] / f"{digest}_{width}.jpg"
+
+    async def _fetch_and_render(self, origin_url: str, digest: str) -> None:
+        """Fetch the origin once and write every thumbnail width"""
+        data = await self._fetch(origin_url)
+        paths = [self._get_path(digest, width) for width in self.widths]
+        await asyncio.to_thread(self._render, data, paths)
+        for path in paths:
+            self._add(path)
+
+    async def _fetch(self, url: str) -> bytes:
+        """Download an origin image with bounded concurrency and size"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.IMAGE_FETCH_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=settings.IMAGE_FETCH_CONCURRENCY,
+                    max_keepalive_connections=settings.IMAGE_FETCH_CONCURRENCY,
+                ),
+            )
+
+        async with self._semaphore:
+            try:
+                async with self._client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get("content-type", "")
+                    if content_type and not content_type.startswith("image/"):
+                        raise ImageFetchError(f"Not an image ({content_type}): {url}")
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > settings.IMAGE_MAX_SOURCE_BYTES:
+                            raise ImageFetchError(f"Image too large: {url}")
+                        chunks.append(chunk)
+                    logger.info("Fetched image %s (%s bytes)", url, size)
+                    return b"".join(chunks)
+            except httpx.HTTPError as e:
+                raise ImageFetchError(f"Error fetching image {url}: {e}") from e
+
+    def _render(self, data: bytes, paths: List[Path]) -> None:
+        """Resize to each thumbnail width (never upscaling) and write atomically"""
+        # Pillow is only needed once the first thumbnail is rendered
+        from PIL import Image
+
+        try:
+            with Image.open(io.BytesIO(data)) as source:
+                source.draft("RGB", (self.widths[-1], self.widths[-1]))
+                source = source.convert("RGB")
+                for width, path in zip(self.widths, paths):
+                    image = source
+                    if image.width > width:
+                        height = round(image.height * width / image.width)
+                        image = image.resize((width, height), Image.Resampling.LANCZOS)
+                    self._write(image, path)
+        except OSError as e:
+            raise ImageFetchError(f"Invalid image data: {e}") from e
+
+    def _write(self, image, path: Path) -> None:
+        """Save a JPEG through a temporary file of its own, then move it in place"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per call: workers sharing the directory may render the same image
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                image.save(tmp_file, "JPEG", quality=80, optimize=True, progressive=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def _refresh_index(self) -> None:
+        """
+        Rebuild the LRU index from disk on first use and every
+        IMAGE_CACHE_SCAN_INTERVAL seconds
+
+        The first scan is awaited; later ones run in the background while
+        requests keep using the current index.
+        """
+        stale = time.monotonic() - self._scanned_at >= settings.IMAGE_CACHE_SCAN_INTERVAL
+        if self._scan_task is None and (self._index is None or stale):
+            self._scan_task = asyncio.ensure_future(self._rescan())
+            self._scan_task.add_done_callback(self._scan_done)
+        if self._index is None:
+            await asyncio.shield(self._scan_task)
+
+    def _scan_done(self, task: asyncio.Future) -> None:
+        self._scan_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Image cache scan failed: %s", task.exception())
+
+    async def _rescan(self) -> None:
+        """
+        Rebuild the LRU index from the cache directory
+
+        Every worker writes to the same directory, so the size limit can only
+        hold if each one counts all files. Hits bump the mtime, which makes it
+        the recency order shared by all workers.
+        """
+        files = await asyncio.to_thread(self._scan)
+        self._index = OrderedDict((path, size) for _, path, size in files)
+        self._total_bytes = sum(self._index.values())
+        self._scanned_at = time.monotonic()
+        self._evict()
+
+    def _scan(self) -> List[Tuple[float, Path, int]]:
+        """(mtime, path, size) of every cached file, oldest first; runs in a thread"""
+        files = []
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.jpg"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    # Evicted by another worker while scanning
+                    continue
+                files.append((stat.st_mtime, path, stat.st_size))
+        files.sort()
+        return files
+
+    def _touch(self, path: Path) -> bool:
+        """Mark a file as recently used; False if it is not on disk"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Not rendered yet, or evicted by another worker
+            if path in self._index:
+                self._total_bytes -= self._index.pop(path)
+            return False
+        if path in self._index:
+            self._index.move_to_end(path)
+        else:
+            # Written by another worker sharing the cache directory
+            self._add(path)
+        return True
+
+    def _add(self, path: Path) -> None:
+        """Add a freshly written file and evict if over the size limit"""
+        if path in self._index:
+            self._total_bytes -= self._index.pop(path)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        self._index[path] = size
+        self._total_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until the directory is under the size limit"""
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            path, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            logger.debug("🗑️  Image cache evicted: %s", path)
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global service instance
+image_service = ImageService()
@@ -2,8 +2,9 @@ from sqlalchemy.orm import Session
 
 from models.item import Item
 from services.base import BaseService
+from services.cached import CachedServiceMixin
 
 
-class ItemService(BaseService):
+class ItemService(CachedServiceMixin, BaseService):
     def __init__(self, db: Session):
         super().__init__(db=db, model=Item)
\ No newline at end of file
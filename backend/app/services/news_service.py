@@ -1,16 +1,37 @@
 import httpx
-from typing import Optional, Dict, List
+import msgspec
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-import hashlib
+import asyncio
+import json
+import re
+import time
 
+from core import deadline
 from core.config import settings
-from core.logger import logger
-from core.redis import redis_manager
-from schemas.news import NewsArticle, NewsResponse
+from core.deadline import DeadlineExceeded
+from core.logger import access_logger, logger
+from core.redis import make_hash_tag, redis_manager
+from schemas.news import Article, CachedNews, NewsChangesPayload, NewsPayload
+from services.image_service import image_service
+from services.providers import PROVIDERS, NewsProvider
+from services.providers.base import published_key
+
+_encoder = msgspec.json.Encoder()
+_cached_decoder = msgspec.json.Decoder(CachedNews)
+_articles_decoder = msgspec.json.Decoder(List[Article])
+
+STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+
+def _parse_stream_id(entry_id: str) -> tuple:
+    """Parse a Redis stream ID ("<ms>-<seq>") into a comparable tuple"""
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
 
 
 class NewsService:
-    """Service to fetch news from NewsAPI with caching"""
+    """Service to fetch news from the configured providers with caching"""
     
     # Available categories
     CATEGORIES = [
@@ -28,12 +49,22 @@ class NewsService:
     _cache_misses = 0
     
     def __init__(self):
-        self.base_url = settings.NEWS_API_BASE_URL
-        self.api_key = settings.NEWS_API_KEY
+        self.providers: List[NewsProvider] = [
+            PROVIDERS[name](
+                timeout=settings.NEWS_PROVIDER_TIMEOUTS.get(name, settings.NEWS_PROVIDER_TIMEOUT)
+            )
+            for name in settings.NEWS_PROVIDERS
+        ]
+        self._client: Optional[httpx.AsyncClient] = None
     
-    def _get_cache_key(self, category: str, page: int = 1) -> str:
-        """Generate unique cache key"""
-        return f"news:{category}:page:{page}"
+    def _get_cache_key(self, category: str, page: int, page_size: int) -> str:
+        """
+        Generate unique cache key, hash-tagged so a category stays on one slot
+        
+        Each page size has its own key, so the change log of a page size is
+        written whenever its page is refreshed.
+        """
+        return f"news:{make_hash_tag(category)}:page:{page}:{page_size}"
     
     async def get_news(
         self,
@@ -41,7 +72,7 @@ class NewsService:
         page: int = 1,
         page_size: int = 5,
         force_refresh: bool = False
-    ) -> NewsResponse:
+    ) -> NewsPayload:
         """
         Get news with caching
         
@@ -55,21 +86,19 @@ class NewsService:
         if category not in self.CATEGORIES:
             category = "technology"
         
-        cache_key = self._get_cache_key(category, page)
+        cache_key = self._get_cache_key(category, page, page_size)
         
         # Try to get from cache
         if not force_refresh:
-            cached_data = await redis_manager.get_json(cache_key)
-            if cached_data:
+            cached_data, ttl = await redis_manager.get_with_ttl(cache_key)
+            cached = self._decode_cached(cache_key, cached_data)
+            if cached:
                 self._cache_hits += 1
-                logger.info(f"Cache HIT: {cache_key}")
-                
-                # Get remaining TTL
-                ttl = await redis_manager.get_ttl(cache_key)
+                access_logger.info("Cache HIT: %s", cache_key)
                 
-                return NewsResponse(
-                    articles=[NewsArticle(**article) for article in cached_data["articles"]],
-                    total_results=cached_data["total_results"],
+                return NewsPayload(
+                    articles=self._to_articles(cached.articles),
+                    total_results=cached.total_results,
                     from_cache=True,
                     cache_ttl=ttl if ttl > 0 else None,
                     category=category
@@ -77,104 +106,361 @@ class NewsService:
         
         # Cache miss - fetch from API
         self._cache_misses += 1
-        logger.info(f"Cache MISS: {cache_key}")
+        access_logger.info("Cache MISS: %s", cache_key)
         
         # Fetch news from API
-        articles_data = await self._fetch_from_api(category, page, page_size)
+        try:
+            articles_data, complete = await self._fetch_from_api(category, page, page_size)
+        except DeadlineExceeded:
+            logger.warning("⏰ Deadline reached before any provider answered: %s", cache_key)
+            return NewsPayload(
+                articles=[],
+                total_results=0,
+                from_cache=False,
+                cache_ttl=None,
+                category=category,
+                degraded=True
+            )
+        
+        proxied = settings.IMAGE_PROXY_ENABLED and await image_service.register(articles_data)
+        
+        if not complete:
+            # Cut short by this request's deadline: serve it, but do not cache it for everyone
+            return NewsPayload(
+                articles=self._to_articles(articles_data, proxied),
+                total_results=len(articles_data),
+                from_cache=False,
+                cache_ttl=None,
+                category=category,
+                degraded=True
+            )
         
         # Save to cache
-        cache_data = {
-            "articles": articles_data,
-            "total_results": len(articles_data),
-        }
-        await redis_manager.set_json(
+        cache_data = CachedNews(
+            articles=articles_data,
+            total_results=len(articles_data),
+        )
+        await redis_manager.set(
             cache_key,
-            cache_data,
-            ttl=settings.CACHE_TTL_NEWS
+            _encoder.encode(cache_data),
+            ttl=await self._observe_fetch(category, page, page_size, articles_data)
         )
         
-        return NewsResponse(
-            articles=[NewsArticle(**article) for article in articles_data],
+        return NewsPayload(
+            articles=self._to_articles(articles_data, proxied),
             total_results=len(articles_data),
             from_cache=False,
             cache_ttl=None,
             category=category
         )
     
-    async def _fetch_from_api(
+    def _get_stats_key(self, category: str, page_size: int) -> str:
+        """Key of the change-rate statistics hash for one category and page size"""
+        return f"news:{make_hash_tag(category)}:stats:{page_size}"
+    
+    async def _observe_fetch(
         self,
         category: str,
         page: int,
-        page_size: int
-    ) -> List[Dict]:
-        """Fetch news from NewsAPI"""
-        
-        # If no API key, return mock data
-        if not self.api_key:
-            logger.warning("NEWS_API_KEY not configured, using mock data")
-            return self._get_mock_data(category, page_size)
-        
-        # Call NewsAPI
-        url = f"{self.base_url}/top-headlines"
-        params = {
-            "category": category,
-            "apiKey": self.api_key,
-            "page": page,
-            "pageSize": page_size,
-            "language": "en",
+        page_size: int,
+        articles_data: List[Article]
+    ) -> int:
+        """
+        Record a fresh fetch and choose its cache TTL
+        
+        Page 1 is diffed against the article IDs seen on the previous fetch of
+        the same size (a shorter page is not churn). Differences are appended to
+        the change log, and the fraction of articles changing per second feeds
+        an EWMA that sets the TTL; other pages reuse the TTL chosen for page 1.
+        """
+        stats_key = self._get_stats_key(category, page_size)
+        stats = await redis_manager.get_hash(stats_key)
+        if stats is None:
+            # Unknown, not empty: diffing against nothing would log every
+            # article as added and reset the change rate
+            logger.warning("Change-rate stats unavailable for %s, using the default TTL", category)
+            return settings.CACHE_TTL_NEWS
+        if page != 1:
+            if not settings.CACHE_TTL_ADAPTIVE:
+                return settings.CACHE_TTL_NEWS
+            return int(stats.get("ttl", settings.CACHE_TTL_NEWS))
+        
+        now = time.time()
+        ids = [article.id for article in articles_data]
+        rate = float(stats["rate"]) if "rate" in stats else None
+        
+        # The first fetch is logged as all-added so sync tokens always exist
+        previous_ids = json.loads(stats.get("ids", "[]"))
+        previous_set, current_set = set(previous_ids), set(ids)
+        added = [a for a in articles_data if a.id not in previous_set]
+        removed = [article_id for article_id in previous_ids if article_id not in current_set]
+        if added or removed:
+            await self._record_changes(category, page_size, added, removed)
+        
+        if "ids" in stats:
+            elapsed = now - float(stats.get("fetched_at", now))
+            if ids and elapsed >= 1:
+                observed = len(added) / len(ids) / elapsed
+                alpha = settings.CACHE_TTL_EWMA_ALPHA
+                rate = observed if rate is None else alpha * observed + (1 - alpha) * rate
+        
+        if not settings.CACHE_TTL_ADAPTIVE or rate is None:
+            ttl = settings.CACHE_TTL_NEWS
+        elif rate <= 0:
+            ttl = settings.CACHE_TTL_NEWS_MAX
+        else:
+            ttl = settings.CACHE_TTL_CHANGE_TARGET / rate
+        ttl = int(min(max(ttl, settings.CACHE_TTL_NEWS_MIN), settings.CACHE_TTL_NEWS_MAX))
+        
+        # Each fetch covers ttl seconds instead of CACHE_TTL_NEWS
+        saved = float(stats.get("calls_saved", 0)) + ttl / settings.CACHE_TTL_NEWS - 1
+        
+        mapping = {
+            "ids": json.dumps(ids),
+            "fetched_at": now,
+            "ttl": ttl,
+            "calls_saved": saved,
         }
+        if rate is not None:
+            mapping["rate"] = rate
+        await redis_manager.set_hash(stats_key, mapping)
+        
+        logger.info("Adaptive TTL for %s: %ss (change rate: %s/s)", category, ttl, rate)
+        return ttl
+    
+    def _get_changes_key(self, category: str, page_size: int) -> str:
+        """Key of the change log stream for one category and page size"""
+        return f"news:{make_hash_tag(category)}:changes:{page_size}"
+    
+    async def _record_changes(
+        self,
+        category: str,
+        page_size: int,
+        added: List[Article],
+        removed: List[str]
+    ) -> None:
+        """Append a change set to the capped stream of a category and page size"""
+        entry_id = await redis_manager.append_stream(
+            self._get_changes_key(category, page_size),
+            {"added": _encoder.encode(added), "removed": json.dumps(removed)},
+            maxlen=settings.NEWS_CHANGES_MAXLEN,
+        )
+        logger.info(
+            "Recorded %s added / %s removed articles for %s (token: %s)",
+            len(added), len(removed), category, entry_id,
+        )
+    
+    async def get_changes(
+        self,
+        category: str = "technology",
+        since: Optional[str] = None,
+        page_size: int = 5
+    ) -> NewsChangesPayload:
+        """
+        Get articles added or removed since a sync token
+        
+        Args:
+            category: News category
+            since: Token from a previous call; None for a full snapshot
+            page_size: Articles per page for full snapshots; tokens are only
+                valid for the page size they were issued for
+        """
+        if category not in self.CATEGORIES:
+            category = "technology"
+        
+        # An expired cache entry means nothing has refreshed the change log
+        if await redis_manager.get_ttl(self._get_cache_key(category, 1, page_size)) == -2:
+            await self.get_news(category=category, page=1, page_size=page_size)
         
+        changes_key = self._get_changes_key(category, page_size)
+        # None when the log cannot be read, which is not the same as no changes
+        last = await redis_manager.stream_range(changes_key, count=1, reverse=True)
+        token = last[0][0] if last else "0-0"
+        
+        if last is not None and since and STREAM_ID_RE.match(since):
+            first = await redis_manager.stream_range(changes_key, count=1)
+            if first is not None and (
+                not first or _parse_stream_id(since) >= _parse_stream_id(first[0][0])
+            ):
+                entries = await redis_manager.stream_range(changes_key, start=f"({since}")
+                if entries is not None:
+                    return self._merge_changes(category, entries, since)
+        
+        # No usable token (first sync, entries trimmed away or the log
+        # unreadable): send everything
+        news = await self.get_news(category=category, page=1, page_size=page_size)
+        if news.degraded and since:
+            # A partial snapshot must not replace the client's list: keep its token
+            return NewsChangesPayload(
+                category=category,
+                token=since,
+                reset=False,
+                added=news.articles,
+                removed=[],
+                degraded=True,
+            )
+        return NewsChangesPayload(
+            category=category,
+            token=token,
+            reset=True,
+            added=news.articles,
+            removed=[],
+            degraded=news.degraded,
+        )
+    
+    def _merge_changes(
+        self,
+        category: str,
+        entries: List,
+        token: str
+    ) -> NewsChangesPayload:
+        """Collapse change log entries into one net change set"""
+        added: Dict[str, Article] = {}
+        removed = set()
+        for entry_id, fields in entries:
+            token = entry_id
+            for article_id in json.loads(fields["removed"]):
+                added.pop(article_id, None)
+                removed.add(article_id)
+            for article in _articles_decoder.decode(fields["added"]):
+                added[article.id] = article
+                removed.discard(article.id)
+        
+        return NewsChangesPayload(
+            category=category,
+            token=token,
+            reset=False,
+            added=self._to_articles(list(added.values())),
+            removed=sorted(removed),
+        )
+    
+    def _decode_cached(self, cache_key: str, value: Optional[str]) -> Optional[CachedNews]:
+        """Decode a cached page, treating malformed entries as misses"""
+        if not value:
+            return None
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get("status") != "ok":
-                    logger.error(f"NewsAPI error: {data.get('message')}")
-                    return self._get_mock_data(category, page_size)
-                
-                # Transform NewsAPI response to our format
-                articles = []
-                for item in data.get("articles", [])[:page_size]:
-                    articles.append({
-                        "id": hashlib.md5(item["url"].encode()).hexdigest(),
-                        "title": item.get("title", "No title"),
-                        "description": item.get("description"),
-                        "content": item.get("content"),
-                        "url": item.get("url"),
-                        "image_url": item.get("urlToImage"),
-                        "published_at": item.get("publishedAt", datetime.now().isoformat()),
-                        "source": item.get("source", {}).get("name", "Unknown"),
-                        "author": item.get("author"),
-                        "category": category,
-                    })
-                
-                logger.info(f"Fetched {len(articles)} articles from NewsAPI")
-                return articles
+            return _cached_decoder.decode(value)
+        except msgspec.DecodeError:
+            logger.error("❌ Invalid JSON in cache: %s", cache_key)
+            return None
+    
+    def _to_articles(self, articles_data: List[Article], proxied: bool = True) -> List[Article]:
+        """
+        Point article images at the caching proxy
+        
+        Args:
+            articles_data: Articles with origin image URLs
+            proxied: Whether their image URLs are registered with the proxy;
+                if not, the origin URLs are kept
+        """
+        if not settings.IMAGE_PROXY_ENABLED or not proxied:
+            return articles_data
+        return [
+            msgspec.structs.replace(
+                article, image_url=image_service.proxy_url(article.id, article.image_url)
+            )
+            if article.image_url else article
+            for article in articles_data
+        ]
+    
+    async def _fetch_from_api(
+        self,
+        category: str,
+        page: int,
+        page_size: int
+    ) -> Tuple[List[Article], bool]:
+        """
+        Fan out to the enabled providers concurrently
+        
+        Each provider gets its own deadline, further bounded by the request's
+        remaining time, and is asked for every article up to the end of the
+        page. Whatever arrived in time is merged, deduplicated by URL hash and
+        sorted newest first; near-duplicate stories are then folded into their
+        newest copy (see services/dedup_service.py), and the page is cut from
+        the merged list so no article falls between two pages.
+        
+        Returns:
+            (articles, complete): complete is False if the request deadline cut
+            a provider short, so the result should not be cached
+        
+        Raises:
+            DeadlineExceeded: the request deadline passed before anything arrived
+        """
+        providers = [provider for provider in self.providers if provider.enabled]
         
-        except Exception as e:
-            logger.error(f"Error fetching from NewsAPI: {e}")
-            return self._get_mock_data(category, page_size)
+        # If no provider is configured, return mock data
+        if not providers:
+            logger.warning("No news provider configured, using mock data")
+            return self._get_mock_data(category, page_size), True
+        
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0, follow_redirects=True)
+        
+        limit = page * page_size
+        timeouts = [
+            deadline.budget(settings.DEADLINE_FETCH_SHARE, cap=provider.timeout)
+            for provider in providers
+        ]
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    provider.fetch(self._client, category, limit),
+                    timeout=timeout,
+                )
+                for provider, timeout in zip(providers, timeouts)
+            ),
+            return_exceptions=True,
+        )
+        
+        complete = True
+        merged: Dict[str, Article] = {}
+        for provider, timeout, result in zip(providers, timeouts, results):
+            if isinstance(result, asyncio.TimeoutError):
+                if timeout < provider.timeout:
+                    complete = False
+                logger.warning("Provider %s missed its %.2fs deadline", provider.name, timeout)
+            elif isinstance(result, Exception):
+                logger.error("Error fetching from %s: %s", provider.name, result)
+            else:
+                for article in result:
+                    merged.setdefault(article.id, article)
+        
+        if not merged:
+            if not complete:
+                raise DeadlineExceeded(f"No provider answered for {category} in time")
+            return self._get_mock_data(category, page_size), True
+        
+        articles = sorted(merged.values(), key=published_key, reverse=True)
+        if settings.DEDUP_ENABLED:
+            # Imported on first use so NumPy stays off the startup path
+            from services.dedup_service import dedup_service
+            articles = dedup_service.collapse(articles)
+        return articles[limit - page_size:limit], complete
     
-    def _get_mock_data(self, category: str, count: int = 5) -> List[Dict]:
+    def _get_mock_data(self, category: str, count: int = 5) -> List[Article]:
         """Mock data when no API key is available"""
         mock_articles = []
         for i in range(count):
-            mock_articles.append({
-                "id": f"mock-{category}-{i}",
-                "title": f"Example {category.title()} News Article #{i+1}",
-                "description": f"This is a mock article about {category} for testing purposes.",
-                "content": f"Full content of the {category} article would go here...",
-                "url": f"https://example.com/{category}/{i}",
-                "image_url": f"https://picsum.photos/800/400?random={i}",
-                "published_at": datetime.now().isoformat(),
-                "source": "Example News",
-                "author": "Test Author",
-                "category": category,
-            })
+            mock_articles.append(Article(
+                id=f"mock-{category}-{i}",
+                title=f"Example {category.title()} News Article #{i+1}",
+                description=f"This is a mock article about {category} for testing purposes.",
+                content=f"Full content of the {category} article would go here...",
+                url=f"https://example.com/{category}/{i}",
+                image_url=f"https://picsum.photos/800/400?random={i}",
+                published_at=datetime.now().isoformat(),
+                source="Example News",
+                author="Test Author",
+                category=category,
+            ))
         return mock_articles
     
+    async def close(self):
+        """Close the pooled upstream HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def invalidate_cache(self, category: Optional[str] = None) -> int:
         """
         Invalidate cache
@@ -186,32 +472,42 @@ class NewsService:
             Number of deleted keys
         """
         if category:
-            # Invalidate only one category
-            pattern = f"news:{category}:*"
+            # Invalidate only one category: every key lives on the same slot
+            pattern = f"news:{make_hash_tag(category)}:page:*"
+            keys = await redis_manager.keys(pattern, hash_tag=category)
         else:
             # Invalidate all news
-            pattern = "news:*"
+            pattern = "news:*:page:*"
+            keys = await redis_manager.keys(pattern)
         
-        keys = await redis_manager.keys(pattern)
+        deleted = await redis_manager.delete_many(keys)
         
-        deleted = 0
-        for key in keys:
-            if await redis_manager.delete(key):
-                deleted += 1
-        
-        logger.info(f"Invalidated {deleted} cache keys (pattern: {pattern})")
+        logger.info("Invalidated %s cache keys (pattern: %s)", deleted, pattern)
         return deleted
     
-    def get_metrics(self) -> Dict:
+    async def get_metrics(self) -> Dict:
         """Get cache metrics"""
         total = self._cache_hits + self._cache_misses
         hit_rate = (self._cache_hits / total * 100) if total > 0 else 0
         
+        adaptive_ttls = {}
+        calls_saved = 0.0
+        for category in self.CATEGORIES:
+            pattern = f"news:{make_hash_tag(category)}:stats:*"
+            for stats_key in await redis_manager.keys(pattern, hash_tag=category):
+                stats = await redis_manager.get_hash(stats_key)
+                if stats and "ttl" in stats:
+                    page_size = stats_key.rpartition(":")[2]
+                    adaptive_ttls[f"{category}:{page_size}"] = int(stats["ttl"])
+                    calls_saved += float(stats.get("calls_saved", 0))
+        
         return {
             "hits": self._cache_hits,
             "misses": self._cache_misses,
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
+            "adaptive_ttls": adaptive_ttls,
+            "upstream_calls_saved": round(calls_saved, 2),
         }
     
     @classmethod
@@ -0,0 +1,10 @@
+from services.providers.base import NewsProvider
+from services.providers.fixtures import FixtureProvider
+from services.providers.newsapi import NewsApiProvider
+from services.providers.rss import RssProvider
+
+# Registry of available providers, selected with settings.NEWS_PROVIDERS
+PROVIDERS = {
+    provider.name: provider
+    for provider in (NewsApiProvider, RssProvider, FixtureProvider)
+}
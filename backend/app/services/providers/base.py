@@ -0,0 +1,51 @@
+import hashlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import List
+
+import httpx
+
+from schemas.news import Article
+
+
+def article_id(url: str) -> str:
+    """Stable article ID, shared by every provider so duplicates collapse"""
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+def published_key(article: Article) -> datetime:
+    """Sort key putting articles in publication order across time zones
+
+    Naive dates are taken as local time; unparseable ones sort oldest.
+    """
+    try:
+        published = datetime.fromisoformat(article.published_at.replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    return published.astimezone(timezone.utc)
+
+
+class NewsProvider(ABC):
+    """Source of news articles for one category at a time"""
+
+    name: str = ""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the provider is configured well enough to be queried"""
+        return True
+
+    @abstractmethod
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        """Fetch up to `limit` of the newest articles, newest first; raise on failure
+
+        Pages are cut by the caller once every provider's articles are merged.
+        """
@@ -0,0 +1,44 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+import httpx
+
+from core.config import settings
+from schemas.news import Article
+from services.providers.base import NewsProvider, published_key
+from services.providers.newsapi import newsapi_decoder, to_articles
+
+
+class FixtureProvider(NewsProvider):
+    """
+    Local JSON fixtures in NewsAPI response format
+
+    Reads ``<NEWS_FIXTURES_DIR>/<category>.json``, so captured NewsAPI
+    responses can be replayed offline.
+    """
+
+    name = "fixtures"
+
+    def __init__(self, timeout: float):
+        super().__init__(timeout)
+        self.directory = Path(settings.NEWS_FIXTURES_DIR) if settings.NEWS_FIXTURES_DIR else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        path = self.directory / f"{category}.json"
+        if not path.exists():
+            return []
+
+        content = await asyncio.to_thread(path.read_bytes)
+        data = newsapi_decoder.decode(content)
+        articles = to_articles(data, category, len(data.articles))
+        return sorted(articles, key=published_key, reverse=True)[:limit]
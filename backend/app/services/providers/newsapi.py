@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import List, Optional
+
+import httpx
+import msgspec
+
+from core.config import settings
+from core.logger import logger
+from schemas.news import Article
+from services.providers.base import NewsProvider, article_id
+
+# Largest pageSize NewsAPI accepts
+NEWSAPI_MAX_PAGE_SIZE = 100
+
+
+class NewsApiSource(msgspec.Struct):
+    name: Optional[str] = None
+
+
+class NewsApiArticle(msgspec.Struct, rename="camel"):
+    url: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    content: Optional[str] = None
+    url_to_image: Optional[str] = None
+    published_at: Optional[str] = None
+    author: Optional[str] = None
+    source: NewsApiSource = msgspec.field(default_factory=NewsApiSource)
+
+
+class NewsApiResponse(msgspec.Struct):
+    status: str
+    message: Optional[str] = None
+    articles: List[NewsApiArticle] = []
+
+
+newsapi_decoder = msgspec.json.Decoder(NewsApiResponse)
+
+
+def to_articles(data: NewsApiResponse, category: str, limit: int) -> List[Article]:
+    """Transform a NewsAPI response to our format"""
+    return [
+        Article(
+            id=article_id(item.url),
+            title=item.title or "No title",
+            description=item.description,
+            content=item.content,
+            url=item.url,
+            image_url=item.url_to_image,
+            published_at=item.published_at or datetime.now().isoformat(),
+            source=item.source.name or "Unknown",
+            author=item.author,
+            category=category,
+        )
+        for item in data.articles[:limit]
+    ]
+
+
+class NewsApiProvider(NewsProvider):
+    """NewsAPI top-headlines, requested in pages of up to NEWSAPI_MAX_PAGE_SIZE"""
+
+    name = "newsapi"
+
+    def __init__(self, timeout: float):
+        super().__init__(timeout)
+        self.base_url = settings.NEWS_API_BASE_URL
+        self.api_key = settings.NEWS_API_KEY
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        page_size = min(limit, NEWSAPI_MAX_PAGE_SIZE)
+        articles: List[Article] = []
+        page = 1
+        while len(articles) < limit:
+            params = {
+                "category": category,
+                "apiKey": self.api_key,
+                "page": page,
+                "pageSize": page_size,
+                "language": "en",
+            }
+            response = await client.get(f"{self.base_url}/top-headlines", params=params)
+            response.raise_for_status()
+            data = newsapi_decoder.decode(response.content)
+
+            if data.status != "ok":
+                raise RuntimeError(f"NewsAPI error: {data.message}")
+
+            articles.extend(to_articles(data, category, limit - len(articles)))
+            if len(data.articles) < page_size:
+                break
+            page += 1
+
+        logger.info("Fetched %s articles from NewsAPI", len(articles))
+        return articles
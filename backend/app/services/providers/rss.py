@@ -0,0 +1,167 @@
+import asyncio
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+import httpx
+
+from core.config import settings
+from core.logger import logger
+from schemas.news import Article
+from services.providers.base import NewsProvider, article_id, published_key
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+ENTRY_TAGS = ("item", f"{ATOM}entry")
+
+
+def _text(element: Element, *tags: str) -> Optional[str]:
+    """Text of the first non-empty child among tags"""
+    for tag in tags:
+        child = element.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _iso_date(value: Optional[str]) -> str:
+    """Normalize RFC 822 (RSS) or ISO 8601 (Atom) dates to ISO 8601"""
+    if value:
+        try:
+            return parsedate_to_datetime(value).isoformat()
+        except (TypeError, ValueError):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+            except ValueError:
+                pass
+    return datetime.now().isoformat()
+
+
+def _image_url(element: Element) -> Optional[str]:
+    """Image from media:content, media:thumbnail or an image enclosure"""
+    for tag in (f"{MEDIA}content", f"{MEDIA}thumbnail"):
+        child = element.find(tag)
+        if child is not None and child.get("url"):
+            return child.get("url")
+    for child in element.iter():
+        if child.tag in ("enclosure", f"{ATOM}link") and child.get("type", "").startswith("image/"):
+            return child.get("url") or child.get("href")
+    return None
+
+
+def _parse_item(element: Element, category: str, source: str) -> Optional[Article]:
+    """Build an article from an RSS <item> or Atom <entry>"""
+    if element.tag == "item":
+        url = _text(element, "link", "guid")
+        published = _text(element, "pubDate", f"{DC}date")
+        description = _text(element, "description")
+        content = _text(element, f"{CONTENT}encoded")
+        author = _text(element, "author", f"{DC}creator")
+        title = _text(element, "title")
+    else:
+        link = element.find(f"{ATOM}link[@rel='alternate']")
+        if link is None:
+            link = element.find(f"{ATOM}link")
+        url = link.get("href") if link is not None else None
+        published = _text(element, f"{ATOM}published", f"{ATOM}updated")
+        description = _text(element, f"{ATOM}summary")
+        content = _text(element, f"{ATOM}content")
+        author = _text(element, f"{ATOM}author/{ATOM}name")
+        title = _text(element, f"{ATOM}title")
+
+    if not url:
+        return None
+
+    return Article(
+        id=article_id(url),
+        title=title or "No title",
+        description=description,
+        content=content,
+        url=url,
+        image_url=_image_url(element),
+        published_at=_iso_date(published),
+        source=source,
+        author=author,
+        category=category,
+    )
+
+
+class RssProvider(NewsProvider):
+    """
+    RSS 2.0 / Atom feeds configured per category in NEWS_RSS_FEEDS
+
+    Feeds are parsed incrementally as bytes arrive, and the download stops
+    as soon as enough entries have been read. Entries of all the category's
+    feeds are merged newest first.
+    """
+
+    name = "rss"
+
+    def __init__(self, timeout: float):
+        super().__init__(timeout)
+        self.feeds = settings.NEWS_RSS_FEEDS
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.feeds)
+
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        urls = self.feeds.get(category, [])
+        results = await asyncio.gather(
+            *(self._fetch_feed(client, url, category, limit) for url in urls),
+            return_exceptions=True,
+        )
+
+        articles = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error("Error fetching feed %s: %s", url, result)
+            else:
+                articles.extend(result)
+        return sorted(articles, key=published_key, reverse=True)[:limit]
+
+    async def _fetch_feed(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        parser = XMLPullParser(events=("start", "end"))
+        source = None
+        in_entry = False
+        articles: List[Article] = []
+
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                try:
+                    parser.feed(chunk)
+                except ParseError as e:
+                    logger.error("Malformed feed %s: %s", url, e)
+                    break
+                for event, element in parser.read_events():
+                    if element.tag in ENTRY_TAGS:
+                        in_entry = event == "start"
+                        if event == "end":
+                            article = _parse_item(element, category, source or response.url.host)
+                            if article:
+                                articles.append(article)
+                            element.clear()
+                    elif event == "end" and not in_entry and source is None:
+                        # The feed's own title names the source
+                        if element.tag in ("title", f"{ATOM}title") and element.text:
+                            source = element.text.strip()
+                if len(articles) >= limit:
+                    break
+
+        logger.info("Fetched %s articles from feed %s", len(articles), url)
+        return articles[:limit]
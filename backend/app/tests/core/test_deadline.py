@@ -0,0 +1,135 @@
+"""
+DeadlineMiddleware: timeout header parsing, 504 on overrun, cancellation on disconnect
+
+Requests are driven straight through the ASGI interface, so each test controls
+when the client disconnects.
+"""
+import asyncio
+import json
+from typing import List, Optional
+
+import pytest
+from starlette.types import Message, Receive, Scope, Send
+
+from core import deadline
+from core.config import settings
+from core.deadline import DeadlineMiddleware
+
+
+def _scope(path: str = "/api/news/", timeout: Optional[str] = None) -> Scope:
+    headers = []
+    if timeout is not None:
+        headers.append((settings.REQUEST_TIMEOUT_HEADER.lower().encode(), timeout.encode()))
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": headers,
+    }
+
+
+class Endpoint:
+    """ASGI app taking `seconds` to answer 200, recording the deadline it ran under"""
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+        self.remaining: Optional[float] = None
+        self.cancelled = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.remaining = deadline.remaining()
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(
+    app: Endpoint, scope: Scope, disconnect_after: Optional[float] = None
+) -> List[Message]:
+    """Send one request through the middleware and return what reached the client"""
+    sent: List[Message] = []
+
+    async def receive() -> Message:
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    async def scenario() -> None:
+        async with asyncio.timeout(5):
+            await DeadlineMiddleware(app)(scope, receive, send)
+
+    asyncio.run(scenario())
+    return sent
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_DEFAULT", 8.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX", 30.0)
+    monkeypatch.setattr(settings, "DEADLINE_GRACE", 0.05)
+
+
+@pytest.mark.parametrize(
+    "header, timeout",
+    [
+        (None, 8.0),
+        ("2.5", 2.5),
+        ("120", 30.0),
+        ("-1", 0.0),
+        ("soon", 8.0),
+        ("", 8.0),
+        ("nan", 8.0),
+        ("inf", 8.0),
+        ("-inf", 8.0),
+    ],
+)
+def test_timeout_header_is_parsed_and_clamped(header: Optional[str], timeout: float) -> None:
+    middleware = DeadlineMiddleware(Endpoint())
+
+    assert middleware._get_timeout(_scope(timeout=header)) == timeout
+
+
+def test_request_runs_under_its_deadline() -> None:
+    app = Endpoint()
+
+    sent = _call(app, _scope(timeout="2"))
+
+    assert sent[0]["status"] == 200
+    assert 1.9 < app.remaining <= 2.0
+
+
+def test_other_paths_get_no_deadline() -> None:
+    app = Endpoint()
+
+    sent = _call(app, _scope(path="/health", timeout="2"))
+
+    assert sent[0]["status"] == 200
+    assert app.remaining is None
+
+
+def test_overrun_is_cancelled_and_answered_with_504() -> None:
+    app = Endpoint(seconds=10)
+
+    sent = _call(app, _scope(timeout="0.05"))
+
+    assert app.cancelled
+    assert sent[0]["status"] == 504
+    assert json.loads(sent[1]["body"]) == {"detail": "Deadline exceeded"}
+
+
+def test_client_disconnect_cancels_the_request() -> None:
+    app = Endpoint(seconds=10)
+
+    sent = _call(app, _scope(timeout="5"), disconnect_after=0.05)
+
+    assert app.cancelled
+    assert sent == []
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+import fakeredis
+import pytest
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.testclient import TestClient
+
+from core.config import settings
+from core.rate_limit import Limit, RateLimiter, RateLimitMiddleware
+from core.redis import GCRA_SCRIPT, make_hash_tag, redis_manager
+
+
+def _request(
+    query: str = "", forwarded: Optional[str] = None, path: str = "/api/news/"
+) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": headers,
+            "client": ("10.0.0.1", 40000),
+        }
+    )
+
+
+def _limiter(monkeypatch: pytest.MonkeyPatch, **overrides) -> RateLimiter:
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+    return RateLimiter()
+
+
+def _rule_names(limiter: RateLimiter, query: str) -> List[str]:
+    return [name for name, _ in limiter.get_limits(_request(query), "10.0.0.1")]
+
+
+FORCE_REFRESH: Dict[str, str] = {"GET /api/news/?force_refresh=true": "10/minute"}
+
+
+@pytest.mark.parametrize(
+    "query", ["force_refresh=true", "force_refresh=1", "force_refresh=TRUE", "force_refresh=on"]
+)
+def test_boolean_param_matches_any_true_spelling(
+    monkeypatch: pytest.MonkeyPatch, query: str
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_ROUTES=FORCE_REFRESH)
+
+    assert _rule_names(limiter, query) == [*FORCE_REFRESH, "default"]
+
+
+@pytest.mark.parametrize("query", ["", "force_refresh=false", "force_refresh=0", "page=1"])
+def test_boolean_param_ignores_false_or_missing(
+    monkeypatch: pytest.MonkeyPatch, query: str
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_ROUTES=FORCE_REFRESH)
+
+    assert _rule_names(limiter, query) == ["default"]
+
+
+def test_client_ignores_forwarded_header_without_trusted_proxy(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_TRUST_PROXY=False)
+
+    assert limiter.get_client(_request(forwarded="1.2.3.4")) == "10.0.0.1"
+
+
+@pytest.mark.parametrize(
+    "hops, forwarded, client",
+    [
+        (1, "203.0.113.7", "203.0.113.7"),
+        # A client-supplied entry on the left cannot pick the identity
+        (1, "1.2.3.4, 203.0.113.7", "203.0.113.7"),
+        (2, "1.2.3.4, 203.0.113.7, 10.1.0.2", "203.0.113.7"),
+        (2, "203.0.113.7", "203.0.113.7"),
+    ],
+)
+def test_client_is_read_trusted_hops_from_the_right(
+    monkeypatch: pytest.MonkeyPatch, hops: int, forwarded: str, client: str
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_TRUST_PROXY=True, RATE_LIMIT_TRUSTED_HOPS=hops)
+
+    assert limiter.get_client(_request(forwarded=forwarded)) == client
+
+
+@pytest.fixture(params=["redis", "local"])
+def store(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Optional[fakeredis.FakeRedis]:
+    """Where GCRA state lives: fakeredis (returned for inspection) or the in-process fallback"""
+    if request.param == "local":
+        monkeypatch.setattr(redis_manager, "available", False)
+        return None
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_manager, "redis", redis)
+    monkeypatch.setattr(redis_manager, "_gcra", redis.register_script(GCRA_SCRIPT))
+    monkeypatch.setattr(redis_manager, "available", True)
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def _check(limiter: RateLimiter, query: str = "") -> Optional[tuple]:
+    return asyncio.run(limiter.check(_request(query)))
+
+
+def _allowed(limiter: RateLimiter, count: int, query: str = "") -> List[bool]:
+    return [_check(limiter, query) is None for _ in range(count)]
+
+
+def test_burst_of_the_limit_is_allowed_then_rejected(
+    monkeypatch: pytest.MonkeyPatch, store: Optional[fakeredis.FakeRedis]
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_DEFAULT="5/minute", RATE_LIMIT_ROUTES={})
+
+    assert _allowed(limiter, 6) == [True] * 5 + [False]
+
+
+def test_one_request_refills_per_emission_interval(
+    monkeypatch: pytest.MonkeyPatch, store: Optional[fakeredis.FakeRedis]
+) -> None:
+    # One request every 100ms, bursts of 10
+    limiter = _limiter(monkeypatch, RATE_LIMIT_DEFAULT="10/second", RATE_LIMIT_ROUTES={})
+    assert _allowed(limiter, 11) == [True] * 10 + [False]
+
+    limit, retry_after = _check(limiter)
+    time.sleep(retry_after + 0.02)
+
+    assert _allowed(limiter, 2) == [True, False]
+
+
+def test_retry_after_is_the_wait_for_the_next_slot(
+    monkeypatch: pytest.MonkeyPatch, store: Optional[fakeredis.FakeRedis]
+) -> None:
+    limiter = _limiter(monkeypatch, RATE_LIMIT_DEFAULT="3/minute", RATE_LIMIT_ROUTES={})
+    _allowed(limiter, 3)
+
+    limit, retry_after = _check(limiter)
+
+    assert limit == Limit(3, 60)
+    # The first of the three requests frees its slot one interval (20s) after it was made
+    assert 19 < retry_after <= 20
+
+
+def test_middleware_sends_retry_after_in_whole_seconds(
+    monkeypatch: pytest.MonkeyPatch, store: Optional[fakeredis.FakeRedis]
+) -> None:
+    monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT", "1/minute")
+    monkeypatch.setattr(settings, "RATE_LIMIT_ROUTES", {})
+    app = RateLimitMiddleware(PlainTextResponse("ok"))
+
+    client = TestClient(app)
+    assert client.get("/api/news/").status_code == 200
+    response = client.get("/api/news/")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
+    assert response.headers["X-RateLimit-Limit"] == "1/60s"
+
+
+def test_request_rejected_by_one_limit_is_not_counted_by_the_others(
+    monkeypatch: pytest.MonkeyPatch, store: Optional[fakeredis.FakeRedis]
+) -> None:
+    limiter = _limiter(
+        monkeypatch, RATE_LIMIT_DEFAULT="2/minute", RATE_LIMIT_ROUTES={**FORCE_REFRESH}
+    )
+    assert _allowed(limiter, 2) == [True, True]
+
+    assert _allowed(limiter, 3, "force_refresh=true") == [False] * 3
+
+    # Only the default limit holds state: the route limit was never counted
+    keys = [*limiter._tats] if store is None else store.keys("ratelimit:*")
+    assert keys == [f"ratelimit:{make_hash_tag('10.0.0.1')}:default"]
@@ -0,0 +1,116 @@
+"""
+RedisManager degraded mode: falling back when Redis fails and recovering
+
+Redis is a fakeredis server whose connection can be cut and restored.
+"""
+import asyncio
+from typing import Awaitable, Callable
+
+import fakeredis
+import pytest
+from redis.exceptions import TimeoutError
+
+from core.config import settings
+from core.redis import RedisManager
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def manager(server: fakeredis.FakeServer, monkeypatch: pytest.MonkeyPatch) -> RedisManager:
+    """RedisManager connecting to the fake server, probing it every 10ms while down"""
+    monkeypatch.setattr(settings, "REDIS_RECONNECT_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "REDIS_RECONNECT_MAX_INTERVAL", 0.02)
+    manager = RedisManager()
+    monkeypatch.setattr(
+        manager,
+        "_create_client",
+        lambda settings: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    return manager
+
+
+def _run(manager: RedisManager, scenario: Callable[[], Awaitable[None]]) -> None:
+    async def main() -> None:
+        await manager.connect()
+        try:
+            await scenario()
+        finally:
+            await manager.disconnect()
+
+    asyncio.run(main())
+
+
+async def _wait_until_available(manager: RedisManager, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not manager.available:
+            await asyncio.sleep(0.01)
+
+
+def test_starts_degraded_and_reconnects_in_background(
+    manager: RedisManager, server: fakeredis.FakeServer
+) -> None:
+    server.connected = False
+
+    async def scenario() -> None:
+        assert not manager.available
+        assert await manager.set("key", "value") is False
+        assert await manager.get("key") is None
+        assert await manager.get_with_ttl("key") == (None, -1)
+
+        server.connected = True
+        await _wait_until_available(manager)
+        assert await manager.set("key", "value")
+        assert await manager.get("key") == "value"
+
+    _run(manager, scenario)
+
+
+def test_connection_error_switches_to_degraded_mode(
+    manager: RedisManager, server: fakeredis.FakeServer
+) -> None:
+    async def scenario() -> None:
+        assert manager.available
+        assert await manager.set("key", "value")
+
+        server.connected = False
+        assert await manager.get("key") is None
+        assert not manager.available
+        # Degraded: commands answer without reaching Redis
+        server.connected = True
+        assert await manager.get("key") is None
+        assert await manager.incr_many(["counter"]) == []
+
+        assert await manager._ping()
+        assert await manager.get("key") == "value"
+
+    _run(manager, scenario)
+
+
+def test_timeout_error_switches_to_degraded_mode(manager: RedisManager) -> None:
+    async def scenario() -> None:
+        async def timeout(*args, **kwargs):
+            raise TimeoutError("Timeout reading from socket")
+
+        manager.redis.setex = timeout
+        assert await manager.set("key", "value") is False
+        assert not manager.available
+
+        del manager.redis.setex
+        await _wait_until_available(manager)
+        assert await manager.set("key", "value")
+
+    _run(manager, scenario)
+
+
+def test_command_error_keeps_redis_available(manager: RedisManager) -> None:
+    async def scenario() -> None:
+        assert await manager.set("text", "not a number")
+
+        assert await manager.incr_many(["text"]) == []
+        assert manager.available
+
+    _run(manager, scenario)
@@ -0,0 +1,224 @@
+"""
+RedisManager against real Redis Cluster and Sentinel deployments
+
+Each topology is started from local redis-server processes; the module is
+skipped when redis-server is not on PATH.
+"""
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Generator, List
+
+import pytest
+import redis
+from redis.crc import key_slot
+
+from core.config import settings
+from core.redis import make_hash_tag, redis_manager
+from services.news_service import news_service
+
+REDIS_SERVER = shutil.which("redis-server")
+
+pytestmark = pytest.mark.skipif(REDIS_SERVER is None, reason="redis-server is not on PATH")
+
+CLUSTER_SLOTS = 16384
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(directory: Path, *args: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [REDIS_SERVER, *args, "--bind", "127.0.0.1", "--save", "", "--appendonly", "no"],
+        cwd=directory,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _wait_for(check: Callable[[], bool], timeout: float = 15.0) -> None:
+    """Poll until check() is true, treating connection errors as not yet"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except redis.exceptions.ConnectionError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError("Redis test deployment did not come up in time")
+
+
+def _stop(processes: List[subprocess.Popen]) -> None:
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait()
+
+
+@pytest.fixture(scope="module")
+def cluster_nodes(tmp_path_factory: pytest.TempPathFactory) -> Generator[str, None, None]:
+    """Three-primary cluster without replicas, as REDIS_CLUSTER_NODES"""
+    directory = tmp_path_factory.mktemp("redis-cluster")
+    ports = [_free_port() for _ in range(3)]
+    processes = [
+        _start_server(
+            directory,
+            "--port", str(port),
+            "--cluster-enabled", "yes",
+            "--cluster-config-file", f"nodes-{port}.conf",
+        )
+        for port in ports
+    ]
+    try:
+        clients = [redis.Redis(port=port) for port in ports]
+        for client in clients:
+            _wait_for(client.ping)
+
+        bounds = [CLUSTER_SLOTS * i // len(ports) for i in range(len(ports) + 1)]
+        for client, start, end in zip(clients, bounds, bounds[1:]):
+            client.cluster("addslots", *range(start, end))
+        for port in ports[1:]:
+            clients[0].cluster("meet", "127.0.0.1", port)
+        for client in clients:
+            _wait_for(lambda client=client: client.cluster("info")["cluster_state"] == "ok")
+
+        yield ",".join(f"127.0.0.1:{port}" for port in ports)
+    finally:
+        _stop(processes)
+
+
+@pytest.fixture(scope="module")
+def sentinel_nodes(tmp_path_factory: pytest.TempPathFactory) -> Generator[str, None, None]:
+    """One primary watched by one sentinel, as REDIS_SENTINEL_NODES"""
+    directory = tmp_path_factory.mktemp("redis-sentinel")
+    primary_port, sentinel_port = _free_port(), _free_port()
+    # Sentinel rewrites its configuration file, so it needs one of its own
+    config = directory / "sentinel.conf"
+    config.write_text(
+        f"port {sentinel_port}\n"
+        f"sentinel monitor {settings.REDIS_SENTINEL_MASTER} 127.0.0.1 {primary_port} 1\n"
+    )
+    processes = [_start_server(directory, "--port", str(primary_port))]
+    try:
+        _wait_for(redis.Redis(port=primary_port).ping)
+        processes.append(
+            subprocess.Popen(
+                [REDIS_SERVER, str(config), "--sentinel"],
+                cwd=directory,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        )
+        sentinel = redis.Redis(port=sentinel_port)
+        _wait_for(
+            lambda: sentinel.sentinel_get_master_addr_by_name(settings.REDIS_SENTINEL_MASTER)
+            == ("127.0.0.1", primary_port)
+        )
+        yield f"127.0.0.1:{sentinel_port}"
+    finally:
+        _stop(processes)
+
+
+def _run(scenario: Callable) -> None:
+    """Run a scenario against redis_manager, connected within the same event loop"""
+
+    async def main() -> None:
+        await redis_manager.connect()
+        try:
+            assert redis_manager.available
+            await scenario()
+        finally:
+            await redis_manager.disconnect()
+
+    asyncio.run(main())
+
+
+async def _fill_news_cache(categories: List[str]) -> None:
+    for category in categories:
+        for page in (1, 2):
+            assert await redis_manager.set(news_service._get_cache_key(category, page, 5), "{}", 60)
+        assert await redis_manager.set(f"other:{make_hash_tag(category)}", "{}", 60)
+
+
+def test_cluster_keeps_category_keys_on_one_slot(
+    cluster_nodes: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "REDIS_MODE", "cluster")
+    monkeypatch.setattr(settings, "REDIS_CLUSTER_NODES", cluster_nodes)
+
+    async def scenario() -> None:
+        assert redis_manager.is_cluster
+        category = "technology"
+        keys = [
+            news_service._get_cache_key(category, 1, 5),
+            news_service._get_stats_key(category, 5),
+            news_service._get_changes_key(category, 5),
+        ]
+        assert {key_slot(key.encode()) for key in keys} == {key_slot(category.encode())}
+
+        # Pipelined commands are routed to the node owning the slot
+        assert await redis_manager.set(keys[0], "cached", 60)
+        assert await redis_manager.get_with_ttl(keys[0]) == ("cached", 60)
+        assert await redis_manager.incr_many(keys[1:2]) == [1]
+        await redis_manager.delete_many(keys)
+
+    _run(scenario)
+
+
+def test_cluster_invalidation_scans_every_slot(
+    cluster_nodes: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "REDIS_MODE", "cluster")
+    monkeypatch.setattr(settings, "REDIS_CLUSTER_NODES", cluster_nodes)
+    categories = news_service.CATEGORIES
+
+    async def scenario() -> None:
+        owners = {
+            redis_manager.redis.get_node_from_key(make_hash_tag(category)).name
+            for category in categories
+        }
+        assert len(owners) > 1, "categories should span several primaries"
+
+        await _fill_news_cache(categories)
+
+        # One category: only its slot's node is scanned, other keys stay
+        assert await news_service.invalidate_cache("health") == 2
+        assert await redis_manager.keys("news:{health}:page:*", hash_tag="health") == []
+        assert await redis_manager.get(news_service._get_cache_key("technology", 1, 5)) == "{}"
+
+        # Every category: pages are found and deleted on every primary
+        assert await news_service.invalidate_cache() == 2 * (len(categories) - 1)
+        assert await redis_manager.keys("news:*:page:*") == []
+        assert len(await redis_manager.keys("other:*")) == len(categories)
+
+        await redis_manager.delete_many(await redis_manager.keys("other:*"))
+
+    _run(scenario)
+
+
+def test_sentinel_resolves_primary(
+    sentinel_nodes: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "REDIS_MODE", "sentinel")
+    monkeypatch.setattr(settings, "REDIS_SENTINEL_NODES", sentinel_nodes)
+
+    async def scenario() -> None:
+        assert not redis_manager.is_cluster
+        assert await redis_manager.set("sentinel:check", "ok", 60)
+        assert await redis_manager.get("sentinel:check") == "ok"
+
+        await _fill_news_cache(["technology", "science"])
+        assert await news_service.invalidate_cache("technology") == 2
+        assert await news_service.invalidate_cache() == 2
+        assert await redis_manager.keys("news:*") == []
+
+        await redis_manager.delete_many(await redis_manager.keys("*"))
+
+    _run(scenario)
@@ -0,0 +1,8 @@
+from core import startup
+
+
+def test_cold_start_within_budget() -> None:
+    report = startup.measure()
+
+    assert report["total"] < startup.STARTUP_BUDGET, report
+    assert report["import"] <= report["ready"] <= report["first_health"]
@@ -0,0 +1,87 @@
+"""/api/items bulk, batch and keyset-paginated routes, against the test SQLite database"""
+from typing import Generator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from models.item import Item
+
+
+@pytest.fixture
+def api(client: TestClient, db_session: Session) -> Generator[TestClient, None, None]:
+    """Test client whose committed items are removed afterwards"""
+    yield client
+    db_session.rollback()
+    db_session.query(Item).delete()
+    db_session.commit()
+
+
+def _create(api: TestClient, *names: str) -> List[dict]:
+    response = api.post("/api/items/bulk", json=[{"name": name} for name in names])
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_bulk_create_returns_items_in_input_order(api: TestClient) -> None:
+    items = _create(api, "c", "a", "b")
+
+    assert [item["name"] for item in items] == ["c", "a", "b"]
+    assert len({item["id"] for item in items}) == 3
+
+
+def test_bulk_update_changes_only_the_given_fields(api: TestClient) -> None:
+    first, second = _create(api, "first", "second")
+
+    response = api.patch(
+        "/api/items/bulk",
+        json=[
+            {"id": first["id"], "description": "updated"},
+            {"id": second["id"], "name": "renamed"},
+        ],
+    )
+
+    assert response.json() == {"updated": 2}
+    assert api.get(f"/api/items/{first['id']}").json() == {**first, "description": "updated"}
+    assert api.get(f"/api/items/{second['id']}").json() == {**second, "name": "renamed"}
+
+
+def test_bulk_update_with_unknown_ids_updates_nothing(api: TestClient) -> None:
+    (item,) = _create(api, "only")
+    unknown = item["id"] + 1000
+
+    response = api.patch(
+        "/api/items/bulk",
+        json=[{"id": item["id"], "name": "renamed"}, {"id": unknown, "name": "ghost"}],
+    )
+
+    assert response.status_code == 404
+    assert str(unknown) in response.json()["detail"]
+    assert api.get(f"/api/items/{item['id']}").json()["name"] == "only"
+
+
+def test_batch_read_follows_the_requested_ids(api: TestClient) -> None:
+    first, second, third = _create(api, "first", "second", "third")
+    ids = [third["id"], first["id"] + 1000, first["id"], third["id"]]
+
+    response = api.get("/api/items/batch", params={"ids": ids})
+
+    assert response.status_code == 200
+    assert response.json() == [third, first]
+
+
+def test_list_pages_with_the_last_id(api: TestClient) -> None:
+    items = _create(api, *(f"item {i}" for i in range(5)))
+
+    pages = []
+    after = None
+    while True:
+        params = {"limit": 2} if after is None else {"limit": 2, "after": after}
+        page = api.get("/api/items/", params=params).json()
+        if not page:
+            break
+        pages.append(page)
+        after = page[-1]["id"]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [item for page in pages for item in page] == items
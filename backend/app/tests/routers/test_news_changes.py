@@ -0,0 +1,179 @@
+"""
+/api/news/changes sync tokens, against fakeredis and a stub provider
+
+Redis is a fakeredis server whose connection can be cut; the upstream is a
+provider whose article list the tests edit between calls.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Generator, List
+
+import fakeredis
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from core.config import settings
+from core.redis import redis_manager
+from main import app
+from schemas.news import Article
+from services.news_service import news_service
+from services.providers.base import NewsProvider
+
+CATEGORY = "technology"
+STARTED = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+class StubProvider(NewsProvider):
+    """Upstream serving articles the tests publish, newest first"""
+
+    name = "stub"
+
+    def __init__(self) -> None:
+        super().__init__(timeout=5.0)
+        self.articles: List[Article] = []
+
+    def publish(self, count: int = 1) -> List[Article]:
+        published = []
+        for _ in range(count):
+            number = len(self.articles)
+            published.append(
+                Article(
+                    id=f"story-{number}",
+                    title=f"Story {number}",
+                    description=None,
+                    content=None,
+                    url=f"https://example.com/{number}",
+                    image_url=None,
+                    published_at=(STARTED + timedelta(minutes=number)).isoformat(),
+                    source="Stub",
+                    author=None,
+                    category=CATEGORY,
+                )
+            )
+            self.articles.insert(0, published[-1])
+        return published
+
+    async def fetch(
+        self,
+        client: httpx.AsyncClient,
+        category: str,
+        limit: int
+    ) -> List[Article]:
+        return self.articles[:limit]
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def provider(monkeypatch: pytest.MonkeyPatch) -> StubProvider:
+    provider = StubProvider()
+    provider.publish(10)
+    monkeypatch.setattr(news_service, "providers", [provider])
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+    return provider
+
+
+@pytest.fixture
+def api(
+    server: fakeredis.FakeServer, provider: StubProvider, monkeypatch: pytest.MonkeyPatch
+) -> Generator[TestClient, None, None]:
+    monkeypatch.setattr(
+        redis_manager,
+        "_create_client",
+        lambda settings: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def _changes(api: TestClient, **params) -> dict:
+    response = api.get("/api/news/changes", params={"category": CATEGORY, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _refresh(api: TestClient, page_size: int = 5) -> dict:
+    response = api.get(
+        "/api/news/",
+        params={"category": CATEGORY, "page_size": page_size, "force_refresh": "true"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _ids(articles: List) -> List[str]:
+    return [article["id"] if isinstance(article, dict) else article.id for article in articles]
+
+
+def test_token_round_trip(api: TestClient, provider: StubProvider) -> None:
+    snapshot = _changes(api)
+    assert snapshot["reset"]
+    assert _ids(snapshot["added"]) == _ids(provider.articles[:5])
+
+    oldest_shown = snapshot["added"][-1]["id"]
+    new = provider.publish()
+    _refresh(api)
+
+    delta = _changes(api, since=snapshot["token"])
+    assert not delta["reset"]
+    assert _ids(delta["added"]) == _ids(new)
+    assert delta["removed"] == [oldest_shown]
+    assert delta["token"] != snapshot["token"]
+
+    unchanged = _changes(api, since=delta["token"])
+    assert not unchanged["reset"]
+    assert unchanged["added"] == [] and unchanged["removed"] == []
+    assert unchanged["token"] == delta["token"]
+
+
+def test_token_older_than_the_trimmed_log_gets_a_reset(
+    api: TestClient, provider: StubProvider, server: fakeredis.FakeServer
+) -> None:
+    token = _changes(api)["token"]
+    for _ in range(3):
+        provider.publish()
+        _refresh(api)
+    fakeredis.FakeRedis(server=server).xtrim(
+        news_service._get_changes_key(CATEGORY, 5), maxlen=1, approximate=False
+    )
+
+    snapshot = _changes(api, since=token)
+
+    assert snapshot["reset"]
+    assert _ids(snapshot["added"]) == _ids(provider.articles[:5])
+    assert snapshot["token"] != token
+
+
+def test_unreadable_log_gets_a_reset_not_an_empty_delta(
+    api: TestClient, provider: StubProvider, server: fakeredis.FakeServer
+) -> None:
+    token = _changes(api)["token"]
+    provider.publish()
+    server.connected = False
+
+    snapshot = _changes(api, since=token)
+
+    assert snapshot["reset"]
+    assert _ids(snapshot["added"]) == _ids(provider.articles[:5])
+
+
+def test_page_sizes_keep_their_own_cache_and_log(
+    api: TestClient, provider: StubProvider, server: fakeredis.FakeServer
+) -> None:
+    token = _changes(api, page_size=6)["token"]
+    new = provider.publish()
+    # Every cached page expires, then a page_size=5 request refills its own
+    redis = fakeredis.FakeRedis(server=server)
+    redis.delete(*redis.keys("news:*:page:*"))
+    _refresh(api, page_size=5)
+
+    delta = _changes(api, page_size=6, since=token)
+    assert not delta["reset"]
+    assert _ids(delta["added"]) == _ids(new)
+
+    news = api.get("/api/news/", params={"category": CATEGORY, "page_size": 6}).json()
+    assert news["from_cache"]
+    assert len(news["articles"]) == 6
@@ -0,0 +1,114 @@
+import math
+from contextlib import contextmanager
+from typing import Generator, Iterator, List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from models.item import Item
+from schemas.item import ItemCreate
+from services.base import BULK_BATCH_SIZE, IN_BATCH_SIZE, BaseService
+
+BULK_ROWS = 100_000
+
+
+@pytest.fixture(scope="function")
+def service(setup_database: None, db_session: Session) -> Generator[BaseService, None, None]:
+    """BaseService over Item; bulk operations commit, so rows are removed afterwards."""
+    yield BaseService(db_session, Item)
+    db_session.rollback()
+    db_session.query(Item).delete()
+    db_session.commit()
+
+
+@contextmanager
+def _statements(session: Session) -> Iterator[List[str]]:
+    """Collect the SQL statements sent to the database, one per round trip"""
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_bulk_create_and_update_100k_rows(service: BaseService) -> None:
+    with _statements(service.db) as inserts:
+        items = service.bulk_create([ItemCreate(name=f"item {i}") for i in range(BULK_ROWS)])
+        ids = [item.id for item in items]
+    with _statements(service.db) as updates:
+        updated = service.bulk_update(
+            [{"id": item_id, "description": "updated"} for item_id in ids]
+        )
+
+    assert [item.name for item in items] == [f"item {i}" for i in range(BULK_ROWS)]
+    assert updated == BULK_ROWS
+    assert service.db.query(Item).filter(Item.description == "updated").count() == BULK_ROWS
+    # One multi-row INSERT per batch, and reading the new IDs costs nothing
+    assert len(inserts) == math.ceil(BULK_ROWS / BULK_BATCH_SIZE)
+    assert all(statement.startswith("INSERT") for statement in inserts)
+    # A single executemany UPDATE
+    assert len(updates) == 1 and updates[0].startswith("UPDATE")
+
+
+def test_bulk_update_unknown_id_is_404_and_changes_nothing(service: BaseService) -> None:
+    items = service.bulk_create([ItemCreate(name="first"), ItemCreate(name="second")])
+    missing_id = items[-1].id + 1
+
+    with pytest.raises(HTTPException) as error:
+        service.bulk_update(
+            [
+                {"id": items[0].id, "name": "changed"},
+                {"id": missing_id, "name": "changed"},
+            ]
+        )
+
+    assert error.value.status_code == 404
+    assert str(missing_id) in error.value.detail
+    assert [item.name for item in service.list_items()] == ["first", "second"]
+
+
+def test_bulk_update_requires_primary_key(service: BaseService) -> None:
+    with pytest.raises(HTTPException) as error:
+        service.bulk_update([{"name": "no id"}])
+
+    assert error.value.status_code == 422
+
+
+def test_get_many_batches_ids_and_keeps_their_order(service: BaseService) -> None:
+    items = service.bulk_create([ItemCreate(name=f"item {i}") for i in range(3)])
+    ids = [item.id for item in items]
+    missing_id = ids[-1] + 1
+    # Duplicates and unknown IDs, padded past one IN (...) batch
+    padding = [missing_id + i for i in range(IN_BATCH_SIZE)]
+    requested = [ids[2], missing_id, ids[0], ids[2], *padding]
+
+    with _statements(service.db) as selects:
+        found = service.get_many(requested)
+
+    assert [item.id for item in found] == [ids[2], ids[0]]
+    assert len(selects) == 2
+
+
+def test_list_items_pages_by_primary_key(service: BaseService) -> None:
+    items = service.bulk_create([ItemCreate(name=f"item {i}") for i in range(5)])
+    ids = [item.id for item in items]
+
+    first = service.list_items(limit=2)
+    second = service.list_items(limit=2, after=first[-1].id)
+    last = service.list_items(limit=2, after=second[-1].id)
+
+    assert [item.id for item in first + second + last] == ids
+    assert service.list_items(limit=2, after=last[-1].id) == []
+
+
+def test_list_items_rejects_after_with_custom_order(service: BaseService) -> None:
+    with pytest.raises(ValueError):
+        service.list_items(order_by="name", after=1)
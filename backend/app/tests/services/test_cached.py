@@ -0,0 +1,173 @@
+"""
+CachedServiceMixin read-through cache, against fakeredis and the test SQLite database
+
+Service calls run in an AnyIO worker thread, as they do from sync routes.
+"""
+from typing import Callable, Generator, List, TypeVar
+
+import anyio
+import anyio.to_thread
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from core.redis import redis_manager
+from models.item import Item
+from schemas.item import ItemCreate, ItemUpdate
+from services.base import BaseService
+from services.item import ItemService
+
+T = TypeVar("T")
+
+
+@pytest.fixture
+def server(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeServer:
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_manager, "redis", fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    )
+    monkeypatch.setattr(redis_manager, "available", True)
+    return server
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """IDs of the items get_item read from the database, in call order"""
+    loaded: List[int] = []
+    get_item = BaseService.get_item
+
+    def counting_get_item(self: BaseService, item_id: int) -> Item:
+        loaded.append(item_id)
+        return get_item(self, item_id)
+
+    monkeypatch.setattr(BaseService, "get_item", counting_get_item)
+    return loaded
+
+
+@pytest.fixture
+def service(
+    setup_database: None, db_session: Session, server: fakeredis.FakeServer
+) -> Generator[ItemService, None, None]:
+    """ItemService over the test database; committed rows are removed afterwards"""
+    yield ItemService(db_session)
+    db_session.rollback()
+    db_session.query(Item).delete()
+    db_session.commit()
+
+
+def _in_worker(func: Callable[[], T]) -> T:
+    return anyio.run(anyio.to_thread.run_sync, func)
+
+
+def _name(service: ItemService, item_id: int) -> str:
+    return _in_worker(lambda: service.get_item(item_id).name)
+
+
+def _keys(server: fakeredis.FakeServer) -> List[str]:
+    return sorted(fakeredis.FakeRedis(server=server, decode_responses=True).keys("entity:*"))
+
+
+def _cached_item(service: ItemService, name: str = "original") -> int:
+    """Create an item and read it until its row is in the cache"""
+    item_id = service.create_item(ItemCreate(name=name)).id
+    _name(service, item_id)  # Seeds the version
+    _name(service, item_id)  # Caches the row under it
+    return item_id
+
+
+def test_first_read_seeds_the_version_without_caching(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int]
+) -> None:
+    item_id = service.create_item(ItemCreate(name="original")).id
+
+    assert _name(service, item_id) == "original"
+
+    (version_key,) = _keys(server)
+    assert version_key.endswith(":version")
+    # Seeded from the clock, not 0, so versions from before an expiry are never reused
+    version = fakeredis.FakeRedis(server=server).get(version_key)
+    assert int(version) > 10**18
+    assert loads == [item_id]
+
+
+def test_second_read_fills_the_cache_and_later_reads_hit_it(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int]
+) -> None:
+    item_id = _cached_item(service)
+
+    assert _name(service, item_id) == "original"
+    assert _name(service, item_id) == "original"
+
+    assert loads == [item_id, item_id]
+    assert len(_keys(server)) == 2
+
+
+def test_lost_version_key_is_not_served_from_old_data(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int]
+) -> None:
+    item_id = _cached_item(service)
+    redis = fakeredis.FakeRedis(server=server, decode_responses=True)
+    (version_key,) = [key for key in _keys(server) if key.endswith(":version")]
+    redis.delete(version_key)
+    service.db.query(Item).filter(Item.id == item_id).update({"name": "changed"})
+    service.db.commit()
+
+    assert _name(service, item_id) == "changed"
+    assert _name(service, item_id) == "changed"
+    assert loads == [item_id] * 4
+
+
+@pytest.mark.parametrize("write", ["update_item", "bulk_update"])
+def test_updates_invalidate_the_cached_row(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int], write: str
+) -> None:
+    item_id = _cached_item(service)
+    stale_keys = [key for key in _keys(server) if not key.endswith(":version")]
+
+    if write == "update_item":
+        _in_worker(lambda: service.update_item(item_id, ItemUpdate(name="renamed")))
+    else:
+        _in_worker(lambda: service.bulk_update([{"id": item_id, "name": "renamed"}]))
+
+    assert not set(stale_keys) & set(_keys(server))
+    assert _name(service, item_id) == "renamed"
+    assert _name(service, item_id) == "renamed"
+    assert loads == [item_id] * 3
+
+
+def test_delete_invalidates_the_cached_row(service: ItemService) -> None:
+    item_id = _cached_item(service)
+
+    _in_worker(lambda: service.delete_item(item_id))
+
+    with pytest.raises(HTTPException) as error:
+        _name(service, item_id)
+    assert error.value.status_code == 404
+
+
+def test_reads_fall_back_to_the_database_while_redis_is_down(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int]
+) -> None:
+    item_id = _cached_item(service)
+    server.connected = False
+
+    assert _name(service, item_id) == "original"
+    assert not redis_manager.available
+    _in_worker(lambda: service.update_item(item_id, ItemUpdate(name="renamed")))
+    assert _name(service, item_id) == "renamed"
+
+    # Two reads filling the cache, then every read goes to the database
+    assert loads == [item_id] * 4
+
+
+def test_cache_is_skipped_outside_a_worker_thread(
+    service: ItemService, server: fakeredis.FakeServer, loads: List[int]
+) -> None:
+    item_id = service.create_item(ItemCreate(name="original")).id
+
+    assert service.get_item(item_id).name == "original"
+    assert service.get_item(item_id).name == "original"
+
+    assert _keys(server) == []
+    assert loads == [item_id, item_id]
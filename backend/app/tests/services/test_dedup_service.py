@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+import pytest
+
+from schemas.news import Article
+from services.dedup_service import DedupService
+
+LAUNCH = (
+    "Acme unveils its first foldable laptop with a twelve hour battery",
+    "The company said the device will ship in March to buyers in Europe and the United States",
+)
+OUTAGE = (
+    "Cloud provider outage takes down payment systems across three continents",
+    "Engineers traced the failure to a faulty configuration change pushed during maintenance",
+)
+CHIPS = (
+    "Regulators approve the merger of two of the largest chip designers",
+    "The deal was cleared on condition that licensing terms stay open to rival manufacturers",
+)
+
+
+def _article(
+    article_id: str, story: tuple, source: str = "Example", edit: Optional[str] = None
+) -> Article:
+    title, description = story
+    if edit is not None:
+        words = title.split()
+        words[2] = edit
+        title = " ".join(words)
+    return Article(
+        id=article_id,
+        title=title,
+        description=description,
+        url=f"https://example.com/{article_id}",
+        published_at="2025-01-06T10:00:00+00:00",
+        source=source,
+        category="technology",
+    )
+
+
+def _ids(articles: List[Article]) -> List[str]:
+    return [article.id for article in articles]
+
+
+@pytest.fixture
+def service() -> DedupService:
+    return DedupService(threshold=0.5, num_perm=64, bands=16)
+
+
+def test_reworded_copies_fold_into_the_first(service: DedupService) -> None:
+    articles = [
+        _article("launch", LAUNCH),
+        _article("launch-reworded", LAUNCH, source="Other", edit="reveals"),
+        _article("launch-copy", LAUNCH, source="Third"),
+    ]
+
+    (story,) = service.collapse(articles)
+
+    assert story.id == "launch"
+    assert story.related_count == 2
+
+
+def test_distinct_stories_are_kept(service: DedupService) -> None:
+    articles = [_article("launch", LAUNCH), _article("outage", OUTAGE), _article("chips", CHIPS)]
+
+    collapsed = service.collapse(articles)
+
+    assert collapsed == articles
+    assert all(article.related_count == 0 for article in collapsed)
+
+
+def test_representatives_keep_their_order(service: DedupService) -> None:
+    articles = [
+        _article("outage", OUTAGE),
+        _article("launch", LAUNCH),
+        _article("outage-copy", OUTAGE, edit="brings"),
+        _article("chips", CHIPS),
+        _article("launch-copy", LAUNCH, edit="shows"),
+    ]
+
+    collapsed = service.collapse(articles)
+
+    assert _ids(collapsed) == ["outage", "launch", "chips"]
+    assert [article.related_count for article in collapsed] == [1, 1, 0]
+
+
+def test_wordless_articles_are_not_folded_together(service: DedupService) -> None:
+    articles = [_article(f"empty-{i}", ("", None)) for i in range(3)]
+
+    assert service.collapse(articles) == articles
+
+
+def test_bands_must_divide_the_permutations() -> None:
+    with pytest.raises(ValueError):
+        DedupService(num_perm=64, bands=10)
@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import io
+from pathlib import Path
+from typing import List, Tuple
+
+import fakeredis
+import httpx
+import pytest
+from PIL import Image
+
+from core.config import settings
+from core.redis import redis_manager
+from schemas.news import Article
+from services.image_service import ImageFetchError, ImageService
+
+WIDTHS = [32, 64]
+
+
+def _jpeg(width: int = 200, height: int = 100) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "steelblue").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _article(article_id: str) -> Article:
+    return Article(
+        id=article_id,
+        title=article_id,
+        description=None,
+        content=None,
+        url=f"https://example.com/{article_id}",
+        image_url=f"https://images.test/{article_id}.jpg",
+        published_at="2025-01-06T10:00:00+00:00",
+        source="Example",
+        author=None,
+        category="technology",
+    )
+
+
+def _digest(article_id: str) -> str:
+    return hashlib.sha256(_article(article_id).image_url.encode()).hexdigest()
+
+
+class Origin:
+    """Stub image origin counting the requests it serves"""
+
+    def __init__(self, body: bytes, content_type: str = "image/jpeg", delay: float = 0.0):
+        self.body = body
+        self.content_type = content_type
+        self.delay = delay
+        self.requests: List[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        await asyncio.sleep(self.delay)
+        return httpx.Response(
+            200, content=self.body, headers={"content-type": self.content_type}
+        )
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(redis_manager, "redis", fakeredis.FakeAsyncRedis(decode_responses=True))
+    monkeypatch.setattr(redis_manager, "available", True)
+
+
+@pytest.fixture
+def service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ImageService:
+    monkeypatch.setattr(settings, "IMAGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "IMAGE_THUMBNAIL_WIDTHS", WIDTHS)
+    return ImageService()
+
+
+def _serve(service: ImageService, origin: Origin) -> None:
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(origin))
+
+
+def _cached_files(service: ImageService) -> List[Path]:
+    return sorted(service.cache_dir.glob("*/*"))
+
+
+def test_miss_renders_every_width_then_hits_disk(service: ImageService) -> None:
+    origin = Origin(_jpeg())
+    _serve(service, origin)
+
+    async def scenario() -> Tuple[Path, Path, Path]:
+        assert await service.register([_article("a")])
+        small = await service.get_thumbnail("a", 20)
+        large = await service.get_thumbnail("a", 64)
+        again = await service.get_thumbnail("a", 20)
+        await service.close()
+        return small, large, again
+
+    small, large, again = asyncio.run(scenario())
+
+    assert len(origin.requests) == 1
+    assert again == small
+    with Image.open(small) as image:
+        assert image.width == 32
+    with Image.open(large) as image:
+        assert image.width == 64
+    # Temporary files were all moved in place
+    assert _cached_files(service) == sorted([small, large])
+
+
+def test_unknown_article_is_not_fetched(service: ImageService) -> None:
+    origin = Origin(_jpeg())
+    _serve(service, origin)
+
+    assert asyncio.run(service.get_thumbnail("unknown")) is None
+    assert origin.requests == []
+
+
+def test_concurrent_misses_share_one_fetch(service: ImageService) -> None:
+    origin = Origin(_jpeg(), delay=0.05)
+    _serve(service, origin)
+
+    async def scenario() -> List[Path]:
+        await service.register([_article("a")])
+        paths = await asyncio.gather(*(service.get_thumbnail("a", 32) for _ in range(5)))
+        await service.close()
+        return paths
+
+    paths = asyncio.run(scenario())
+
+    assert len(origin.requests) == 1
+    assert len(set(paths)) == 1 and paths[0].exists()
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [(b"<html>Not found</html>", "text/html"), (b"not a jpeg", "image/jpeg")],
+)
+def test_non_image_upstream_is_rejected(
+    service: ImageService, body: bytes, content_type: str
+) -> None:
+    _serve(service, Origin(body, content_type))
+
+    async def scenario() -> None:
+        await service.register([_article("a")])
+        try:
+            await service.get_thumbnail("a")
+        finally:
+            await service.close()
+
+    with pytest.raises(ImageFetchError):
+        asyncio.run(scenario())
+    assert _cached_files(service) == []
+
+
+def test_least_recently_used_images_are_evicted(service: ImageService) -> None:
+    _serve(service, Origin(_jpeg()))
+
+    async def scenario() -> int:
+        await service.register([_article(name) for name in "abc"])
+        await service.get_thumbnail("a")
+        image_bytes = service._total_bytes
+        # Room for the thumbnails of two images
+        service.max_bytes = 2 * image_bytes
+        await service.get_thumbnail("b")
+        await service.get_thumbnail("a")
+        await service.get_thumbnail("c")
+        await service.close()
+        return image_bytes
+
+    image_bytes = asyncio.run(scenario())
+
+    files = _cached_files(service)
+    assert sum(path.stat().st_size for path in files) <= 2 * image_bytes
+    digests = {path.name.split("_")[0] for path in files}
+    assert len(digests) == 2
+    # "b" was the least recently used
+    assert not any(path.name.startswith(_digest("b")) for path in files)
+
+
+def test_scan_counts_files_written_by_other_workers(service: ImageService) -> None:
+    other_worker = ImageService()
+    _serve(service, Origin(_jpeg()))
+    _serve(other_worker, Origin(_jpeg()))
+
+    async def scenario() -> None:
+        await service.register([_article("a"), _article("b")])
+        await service.get_thumbnail("a")
+        await other_worker.get_thumbnail("b")
+
+        service._scanned_at = 0.0  # Next request rescans in the background
+        await service.get_thumbnail("a")
+        await service._scan_task
+        await service.close()
+        await other_worker.close()
+
+    asyncio.run(scenario())
+
+    assert set(service._index) == set(_cached_files(service))
@@ -0,0 +1,88 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from core.config import settings
+from services.news_service import NewsService
+from services.providers.rss import RssProvider
+
+STUBS = Path(__file__).parent / "stubs"
+FEEDS = {
+    "https://wire.test/rss": STUBS / "wire.xml",
+    "https://journal.test/atom": STUBS / "journal.xml",
+}
+
+# Every article of the stub feeds and fixtures, newest first
+NEWEST_FIRST = [
+    "Wire 10:00",
+    "Journal 09:00",
+    "Wire 08:00",
+    "Fixture 07:30",
+    "Journal 07:00",
+    "Wire 06:00",
+    "Journal 05:00",
+    "Wire 04:00",
+    "Journal 03:00",
+    "Fixture 02:00",
+]
+
+
+def _serve_stub(request: httpx.Request) -> httpx.Response:
+    path = FEEDS.get(str(request.url))
+    if path is None:
+        return httpx.Response(404)
+    return httpx.Response(200, content=path.read_bytes())
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(_serve_stub))
+
+
+@pytest.fixture(autouse=True)
+def stub_providers(monkeypatch: pytest.MonkeyPatch) -> None:
+    """RSS served from the stub feeds and fixtures read from the stub directory"""
+    monkeypatch.setattr(settings, "NEWS_PROVIDERS", ["rss", "fixtures"])
+    monkeypatch.setattr(settings, "NEWS_RSS_FEEDS", {"technology": list(FEEDS)})
+    monkeypatch.setattr(settings, "NEWS_FIXTURES_DIR", str(STUBS))
+    monkeypatch.setattr(settings, "DEDUP_ENABLED", False)
+
+
+def _titles(articles) -> List[str]:
+    return [article.title for article in articles]
+
+
+def test_rss_merges_feeds_by_date() -> None:
+    async def fetch() -> List[str]:
+        async with _client() as client:
+            articles = await RssProvider(timeout=5.0).fetch(client, "technology", 5)
+        return _titles(articles)
+
+    feeds_only = [title for title in NEWEST_FIRST if not title.startswith("Fixture")]
+    assert asyncio.run(fetch()) == feeds_only[:5]
+
+
+def test_pages_are_cut_from_the_merged_providers() -> None:
+    page_size = 3
+
+    async def fetch_pages() -> List[List[str]]:
+        service = NewsService()
+        service._client = _client()
+        pages = []
+        try:
+            for page in range(1, 5):
+                articles, complete = await service._fetch_from_api("technology", page, page_size)
+                assert complete
+                pages.append(_titles(articles))
+        finally:
+            await service.close()
+        return pages
+
+    pages = asyncio.run(fetch_pages())
+
+    assert pages == [
+        NEWEST_FIRST[start:start + page_size]
+        for start in range(0, 4 * page_size, page_size)
+    ]
@@ -0,0 +1,70 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+
+from core.config import settings
+from schemas.news import Article
+from services.image_service import image_service
+from services.news_service import NewsService
+
+ORIGIN_IMAGE = "https://cdn.example.com/story.jpg"
+ARTICLE = Article(
+    id="story",
+    title="Story",
+    description=None,
+    content=None,
+    url="https://example.com/story",
+    image_url=ORIGIN_IMAGE,
+    published_at="2025-01-06T10:00:00+00:00",
+    source="Example",
+    author=None,
+    category="technology",
+)
+
+
+@pytest.fixture
+def degraded_service(monkeypatch: pytest.MonkeyPatch) -> NewsService:
+    """NewsService whose fetch is always cut short by the request deadline"""
+
+    async def fetch_cut_short(*args) -> Tuple[List[Article], bool]:
+        return [ARTICLE], False
+
+    service = NewsService()
+    monkeypatch.setattr(service, "_fetch_from_api", fetch_cut_short)
+    monkeypatch.setattr(settings, "IMAGE_PROXY_ENABLED", True)
+    return service
+
+
+def _stub_register(monkeypatch: pytest.MonkeyPatch, stored: bool) -> List[List[Article]]:
+    registered: List[List[Article]] = []
+
+    async def register(articles: List[Article]) -> bool:
+        registered.append(articles)
+        return stored
+
+    monkeypatch.setattr(image_service, "register", register)
+    return registered
+
+
+def test_degraded_response_registers_proxied_images(
+    degraded_service: NewsService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    registered = _stub_register(monkeypatch, stored=True)
+
+    payload = asyncio.run(degraded_service.get_news(force_refresh=True))
+
+    assert payload.degraded
+    assert registered == [[ARTICLE]]
+    assert payload.articles[0].image_url == image_service.proxy_url(ARTICLE.id, ORIGIN_IMAGE)
+
+
+def test_degraded_response_keeps_origin_images_if_registration_fails(
+    degraded_service: NewsService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _stub_register(monkeypatch, stored=False)
+
+    payload = asyncio.run(degraded_service.get_news(force_refresh=True))
+
+    assert payload.degraded
+    assert payload.articles[0].image_url == ORIGIN_IMAGE
@@ -0,0 +1,159 @@
+"""Adaptive news TTLs: change-rate EWMA, clamping and the calls_saved metric"""
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import fakeredis
+import pytest
+
+import services.news_service as news_module
+from core.config import settings
+from core.redis import redis_manager
+from schemas.news import Article
+from services.news_service import NewsService
+
+CATEGORY = "technology"
+PAGE_SIZE = 5
+
+
+def _articles(*ids: str) -> List[Article]:
+    return [
+        Article(
+            id=article_id,
+            title=f"Story {article_id}",
+            description=None,
+            content=None,
+            url=f"https://example.com/{article_id}",
+            image_url=None,
+            published_at="2025-01-06T10:00:00+00:00",
+            source="Example",
+            author=None,
+            category=CATEGORY,
+        )
+        for article_id in ids
+    ]
+
+
+class Clock:
+    """Stand-in for time.time() that only moves when told to"""
+
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(news_module, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> NewsService:
+    monkeypatch.setattr(redis_manager, "redis", fakeredis.FakeAsyncRedis(decode_responses=True))
+    monkeypatch.setattr(redis_manager, "available", True)
+    for name, value in {
+        "CACHE_TTL_ADAPTIVE": True,
+        "CACHE_TTL_NEWS": 180,
+        "CACHE_TTL_NEWS_MIN": 60,
+        "CACHE_TTL_NEWS_MAX": 1800,
+        "CACHE_TTL_EWMA_ALPHA": 0.3,
+        "CACHE_TTL_CHANGE_TARGET": 0.2,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    return NewsService()
+
+
+def _observe(service: NewsService, fetches: List[tuple], clock: Clock, page: int = 1) -> List[int]:
+    """TTLs chosen for (seconds later, article IDs) fetches of one category"""
+
+    async def scenario() -> List[int]:
+        ttls = []
+        for seconds, ids in fetches:
+            clock.now += seconds
+            ttls.append(
+                await service._observe_fetch(CATEGORY, page, PAGE_SIZE, _articles(*ids))
+            )
+        return ttls
+
+    return asyncio.run(scenario())
+
+
+def _stats(service: NewsService) -> dict:
+    return asyncio.run(redis_manager.get_hash(service._get_stats_key(CATEGORY, PAGE_SIZE)))
+
+
+def test_first_fetch_uses_the_default_ttl(service: NewsService, clock: Clock) -> None:
+    assert _observe(service, [(0, "abcde")], clock) == [180]
+
+    stats = _stats(service)
+    assert "rate" not in stats
+    assert float(stats["calls_saved"]) == 0
+
+
+def test_change_rate_is_an_ewma_of_new_articles(service: NewsService, clock: Clock) -> None:
+    ttls = _observe(
+        service,
+        [
+            (0, "abcde"),
+            # 1 of 5 articles new after 100s: 0.002/s, refresh after 0.2 / 0.002 = 100s
+            (100, "fabcd"),
+            # Nothing new: 0.3 * 0 + 0.7 * 0.002 = 0.0014/s -> 142s
+            (100, "fabcd"),
+        ],
+        clock,
+    )
+
+    assert ttls == [180, 100, 142]
+    assert float(_stats(service)["rate"]) == pytest.approx(0.0014)
+
+
+def test_ttl_is_clamped_to_its_bounds(service: NewsService, clock: Clock) -> None:
+    ttls = _observe(
+        service,
+        [
+            (0, "abcde"),
+            # Every article replaced within 1s: 0.2s, raised to the minimum
+            (1, "fghij"),
+        ],
+        clock,
+    )
+    assert ttls[-1] == settings.CACHE_TTL_NEWS_MIN
+
+    asyncio.run(redis_manager.delete_many([service._get_stats_key(CATEGORY, PAGE_SIZE)]))
+    # 1 of 5 articles new in a day: ~0.2 days, lowered to the maximum
+    ttls = _observe(service, [(0, "abcde"), (86400, "kabcd")], clock)
+    assert ttls[-1] == settings.CACHE_TTL_NEWS_MAX
+
+
+def test_unchanged_page_gets_the_maximum_ttl(service: NewsService, clock: Clock) -> None:
+    assert _observe(service, [(0, "abcde"), (100, "abcde")], clock)[-1] == 1800
+
+
+def test_other_pages_reuse_the_page_one_ttl(service: NewsService, clock: Clock) -> None:
+    _observe(service, [(0, "abcde"), (100, "fabcd")], clock)
+    stats = _stats(service)
+
+    assert _observe(service, [(100, "vwxyz")], clock, page=2) == [100]
+    assert _stats(service) == stats
+
+
+def test_fixed_ttl_when_adaptive_ttls_are_off(
+    service: NewsService, clock: Clock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "CACHE_TTL_ADAPTIVE", False)
+
+    assert _observe(service, [(0, "abcde"), (100, "abcde")], clock) == [180, 180]
+
+
+def test_metrics_report_ttls_and_calls_saved(service: NewsService, clock: Clock) -> None:
+    # Each fetch covering ttl seconds saves ttl / CACHE_TTL_NEWS - 1 calls
+    _observe(service, [(0, "abcde"), (100, "abcde"), (1800, "abcde")], clock)
+
+    metrics = asyncio.run(service.get_metrics())
+
+    assert metrics["adaptive_ttls"] == {f"{CATEGORY}:{PAGE_SIZE}": 1800}
+    assert metrics["upstream_calls_saved"] == pytest.approx(0 + 9 + 9)
@@ -9,6 +9,7 @@ export interface NewsArticle {
   source: string;
   author: string | null;
   category: string;
+  related_count: number;
 }
 
 export interface NewsResponse {
@@ -17,6 +18,16 @@ export interface NewsResponse {
   from_cache: boolean;
   cache_ttl: number | null;
   category: string;
+  degraded: boolean;
+}
+
+export interface NewsChangesResponse {
+  category: string;
+  token: string;
+  reset: boolean;
+  added: NewsArticle[];
+  removed: string[];
+  degraded: boolean;
 }
 
 export interface CacheMetrics {
@@ -24,4 +35,6 @@ export interface CacheMetrics {
   misses: number;
   total_requests: number;
   hit_rate_percent: number;
+  adaptive_ttls: Record<string, number>;
+  upstream_calls_saved: number;
 }
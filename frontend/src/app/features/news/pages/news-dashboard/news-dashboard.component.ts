@@ -25,6 +25,7 @@ export class NewsDashboardComponent implements OnInit, OnDestroy {
   loading = false;
   error: string | null = null;
   fromCache = false;
+  private syncToken: string | null = null;
   private autoRefreshSubscription?: Subscription;
 
   constructor(private newsService: NewsService) {}
@@ -41,11 +42,15 @@ export class NewsDashboardComponent implements OnInit, OnDestroy {
   loadNews(): void {
     this.loading = true;
     this.error = null;
+    this.syncToken = null;
 
     this.newsService.getNews(this.selectedCategory, 1, 6).subscribe({
       next: (response) => {
         this.articles = response.articles;
         this.fromCache = response.from_cache;
+        if (response.degraded) {
+          this.error = 'Some news sources are slow to respond. Results may be incomplete.';
+        }
         this.loading = false;
       },
       error: (err) => {
@@ -64,7 +69,32 @@ export class NewsDashboardComponent implements OnInit, OnDestroy {
   startAutoRefresh(): void {
     // Auto refresh every 5 minutes
     this.autoRefreshSubscription = interval(300000).subscribe(() => {
-      this.loadNews();
+      this.syncChanges();
+    });
+  }
+
+  /**
+   * Apply only the articles added or removed since the last sync
+   */
+  syncChanges(): void {
+    const category = this.selectedCategory;
+
+    this.newsService.getChanges(category, this.syncToken, 6).subscribe({
+      next: (changes) => {
+        if (category !== this.selectedCategory) return;
+
+        if (changes.reset) {
+          this.articles = changes.added;
+        } else if (changes.added.length || changes.removed.length) {
+          const changed = new Set([...changes.removed, ...changes.added.map((a) => a.id)]);
+          this.articles = [
+            ...changes.added,
+            ...this.articles.filter((a) => !changed.has(a.id))
+          ].slice(0, 6);
+        }
+        this.syncToken = changes.token;
+      },
+      error: (err) => console.error('Error syncing news:', err)
     });
   }
 
@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
-import { NewsResponse, CacheMetrics } from '../models/news.model';
+import { NewsResponse, NewsChangesResponse, CacheMetrics } from '../models/news.model';
 
 @Injectable({
   providedIn: 'root'
@@ -29,6 +29,24 @@ export class NewsService {
     return this.http.get<NewsResponse>(`${this.apiUrl}/`, { params });
   }
 
+  /**
+   * Get articles added or removed since the last sync token
+   */
+  getChanges(
+    category: string = 'technology',
+    since: string | null = null,
+    pageSize: number = 6
+  ): Observable<NewsChangesResponse> {
+    let params = new HttpParams()
+      .set('category', category)
+      .set('page_size', pageSize.toString());
+    if (since) {
+      params = params.set('since', since);
+    }
+
+    return this.http.get<NewsChangesResponse>(`${this.apiUrl}/changes`, { params });
+  }
+
   /**
    * Get available categories
    */